@@ -464,6 +464,9 @@ class AgentManager:
             }
 
         finally:
+            # Release the agent output log handle for this task
+            self.logger.close_task(task.task_id)
+
             # Cleanup temporary MCP config file
             if mcp_config_path:
                 try:
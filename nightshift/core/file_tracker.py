@@ -3,14 +3,23 @@ File Tracker - Monitors file system changes during task execution
 Tracks which files were created, modified, or deleted
 """
 import os
+import sys
 import json
+import hashlib
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 
 
-@dataclass
+# Files larger than this are compared by mtime only when content hashing
+CONTENT_HASH_MAX_SIZE = 64 * 1024
+
+# Directories never descended into (hidden directories are skipped too)
+IGNORED_DIRS = frozenset({'node_modules', '__pycache__', 'venv'})
+
+
+@dataclass(slots=True, frozen=True)
 class FileChange:
     """Represents a file system change"""
     path: str
@@ -22,52 +31,178 @@ class FileChange:
 class FileTracker:
     """Tracks file changes during task execution"""
 
-    def __init__(self, watch_dir: str = "."):
+    def __init__(
+        self,
+        watch_dir: str = ".",
+        fast_idle_check: bool = False,
+        content_hash: bool = False,
+    ):
+        """
+        Args:
+            watch_dir: Directory to monitor
+            fast_idle_check: Skip the closing snapshot when no watched
+                directory's mtime has changed. A directory's mtime only
+                moves when entries are added, removed or renamed in it, so
+                enable this only when in-place edits of existing files can
+                be ignored.
+            content_hash: Fingerprint small files at start so that files
+                whose mtime moved but whose content is identical (e.g. a
+                bare touch) are not reported as modified
+        """
         self.watch_dir = Path(watch_dir).resolve()
+        self.fast_idle_check = fast_idle_check
+        self.content_hash = content_hash
         self.snapshot_before: Dict[str, float] = {}
         self.snapshot_after: Dict[str, float] = {}
+        self.fingerprints_before: Dict[str, Tuple[int, Optional[str]]] = {}
+        self._dir_mtimes_ns: Optional[Dict[str, int]] = None
 
-    def take_snapshot(self) -> Dict[str, float]:
+    def take_snapshot(
+        self, fingerprints: Optional[Dict[str, Tuple[int, Optional[str]]]] = None
+    ) -> Dict[str, float]:
         """
         Take a snapshot of all files in the watch directory
         Returns dict of {filepath: mtime}
+
+        If a fingerprints dict is given, it is filled with
+        {filepath: (size, content_hash)} for each file in the snapshot
         """
         snapshot = {}
 
-        for root, dirs, files in os.walk(self.watch_dir):
+        # os.walk yields roots prefixed with watch_dir, so relative paths
+        # are a plain slice rather than a relative_to() call per file
+        watch_root = str(self.watch_dir)
+        base_len = len(os.path.join(watch_root, ""))
+
+        for root, dirs, files in os.walk(watch_root):
             # Skip hidden directories and common ignore patterns
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv']]
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in IGNORED_DIRS]
+
+            rel_root = "" if root == watch_root else root[base_len:] + os.sep
 
             for file in files:
                 if file.startswith('.'):
                     continue
 
-                filepath = Path(root) / file
+                filepath = os.path.join(root, file)
                 try:
-                    stat = filepath.stat()
-                    # Store relative path and mtime
-                    rel_path = str(filepath.relative_to(self.watch_dir))
+                    stat = os.stat(filepath)
+                    # Store relative path and mtime; interning shares the key
+                    # strings between the before/after snapshots
+                    rel_path = sys.intern(rel_root + file)
                     snapshot[rel_path] = stat.st_mtime
-                except (OSError, ValueError):
+                    if fingerprints is not None:
+                        fingerprints[rel_path] = (
+                            stat.st_size,
+                            self._hash_file(filepath, stat.st_size),
+                        )
+                except OSError:
                     continue
 
         return snapshot
 
     def start_tracking(self):
         """Start tracking - take initial snapshot"""
-        self.snapshot_before = self.take_snapshot()
+        if self.fast_idle_check:
+            self._dir_mtimes_ns = self._stat_dir_mtimes_ns()
+        self.fingerprints_before = {}
+        self.snapshot_before = self.take_snapshot(
+            self.fingerprints_before if self.content_hash else None
+        )
 
     def stop_tracking(self) -> List[FileChange]:
         """
         Stop tracking and return list of changes
         """
+        # All changes are stamped with the moment tracking stopped
+        now = datetime.now().isoformat()
+        if (
+            self.fast_idle_check
+            and self._dir_mtimes_ns is not None
+            and not self._dirs_changed()
+        ):
+            # Nothing was added or removed in any directory; treat as idle
+            self.snapshot_after = self.snapshot_before
+            return []
         self.snapshot_after = self.take_snapshot()
-        return self.get_changes()
+        return self.get_changes(timestamp=now)
+
+    def _iter_dirs(self):
+        """
+        Yield (relative path, mtime in ns) for watch_dir and every directory
+        take_snapshot descends into, without stat-ing any files
+        """
+        watch_root = str(self.watch_dir)
+        try:
+            yield "", os.stat(watch_root).st_mtime_ns
+        except OSError:
+            return
+
+        pending = [("", watch_root)]
+        while pending:
+            rel_dir, dir_path = pending.pop()
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.') or entry.name in IGNORED_DIRS:
+                    continue
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                except OSError:
+                    continue
+                rel_path = rel_dir + entry.name + os.sep
+                yield rel_path, mtime_ns
+                pending.append((rel_path, entry.path))
+
+    def _stat_dir_mtimes_ns(self) -> Optional[Dict[str, int]]:
+        """Return {relative dir path: mtime in ns}, or None if watch_dir is unreadable"""
+        mtimes = dict(self._iter_dirs())
+        return mtimes or None
+
+    def _dirs_changed(self) -> bool:
+        """Check whether any watched directory appeared or has a new mtime"""
+        seen = 0
+        for rel_path, mtime_ns in self._iter_dirs():
+            if self._dir_mtimes_ns.get(rel_path) != mtime_ns:
+                return True
+            seen += 1
+        # A vanished directory also bumps its parent, but check anyway
+        return seen != len(self._dir_mtimes_ns)
+
+    @staticmethod
+    def _hash_file(filepath: Union[str, Path], size: int) -> Optional[str]:
+        """Return a content digest for small files, None for large/unreadable ones"""
+        if size > CONTENT_HASH_MAX_SIZE:
+            return None
+        try:
+            with open(filepath, "rb") as f:
+                return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+
+    def _content_unchanged(self, path: str, filepath: Path, size: Optional[int]) -> bool:
+        """Check whether a file with a newer mtime still has its original content"""
+        before = self.fingerprints_before.get(path)
+        if before is None or size is None:
+            return False
+        before_size, before_hash = before
+        if before_hash is None or size != before_size:
+            return False
+        return self._hash_file(filepath, size) == before_hash
 
-    def get_changes(self) -> List[FileChange]:
-        """Compare snapshots and return list of changes"""
+    def get_changes(self, timestamp: Optional[str] = None) -> List[FileChange]:
+        """
+        Compare snapshots and return list of changes
+
+        Args:
+            timestamp: ISO timestamp shared by every change (defaults to now)
+        """
         changes = []
-        now = datetime.now().isoformat()
+        now = timestamp or datetime.now().isoformat()
 
         # Find created and modified files
         for path, mtime in self.snapshot_after.items():
@@ -85,6 +220,9 @@ class FileTracker:
                 # Modified file
                 filepath = self.watch_dir / path
                 size = filepath.stat().st_size if filepath.exists() else None
+                if self.content_hash and self._content_unchanged(path, filepath, size):
+                    # Touched but not edited
+                    continue
                 changes.append(FileChange(
                     path=path,
                     change_type='modified',
@@ -108,13 +246,19 @@ class FileTracker:
         """Save file changes to a JSON file"""
         output_path = Path(output_dir) / f"{task_id}_files.json"
 
-        data = {
-            "task_id": task_id,
-            "timestamp": datetime.now().isoformat(),
-            "changes": [asdict(change) for change in changes]
-        }
-
-        with open(output_path, "w") as f:
-            json.dump(data, f, indent=2)
+        # Stream one change per line rather than building the whole
+        # document in memory first
+        with open(output_path, "w", buffering=65536) as f:
+            f.write('{\n  "task_id": ')
+            f.write(json.dumps(task_id))
+            f.write(',\n  "timestamp": ')
+            f.write(json.dumps(datetime.now().isoformat()))
+            f.write(',\n  "changes": [')
+            separator = "\n    "
+            for change in changes:
+                f.write(separator)
+                f.write(json.dumps(asdict(change)))
+                separator = ",\n    "
+            f.write("\n  ]\n}\n" if changes else "]\n}\n")
 
         return str(output_path)
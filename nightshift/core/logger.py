@@ -4,9 +4,54 @@ Tracks all agent decisions, tool calls, and outputs
 """
 import logging
 import json
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TextIO
+
+
+class _LazyJson:
+    """Defers JSON encoding of a log argument until the message is rendered"""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, indent=2)
+
+
+class FastFormatter(logging.Formatter):
+    """
+    File formatter producing "asctime - name - levelname - message" lines
+
+    The date part of the timestamp is rendered once per second and reused,
+    avoiding a strftime call and %-style template parsing for every record.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._cache_sec: Optional[int] = None
+        self._cache_str = ""
+
+    def format(self, record: logging.LogRecord) -> str:
+        now = int(record.created)
+        if now != self._cache_sec:
+            self._cache_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._cache_sec = now
+        line = (
+            f"{self._cache_str},{int(record.msecs):03d} - {record.name} - "
+            f"{record.levelname} - {record.getMessage()}"
+        )
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        return line
 
 
 class NightShiftLogger:
@@ -38,13 +83,14 @@ class NightShiftLogger:
             self.log_dir / f"nightshift_{datetime.now():%Y%m%d}.log"
         )
         file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        file_handler.setFormatter(file_formatter)
+        file_handler.setFormatter(FastFormatter())
 
         self.logger.addHandler(file_handler)
 
+        # Open per-task agent output files, kept open across writes until
+        # close_task (AgentManager calls it when a task finishes)
+        self._agent_files: Dict[str, TextIO] = {}
+
     def log_task_created(self, task_id: str, description: str):
         """Log task creation"""
         self.logger.info(f"Task created: {task_id}")
@@ -61,8 +107,9 @@ class NightShiftLogger:
 
     def log_tool_call(self, task_id: str, tool_name: str, params: Dict[str, Any]):
         """Log individual tool calls from Claude"""
-        self.logger.debug(f"[{task_id}] Tool call: {tool_name}")
-        self.logger.debug(f"  Parameters: {json.dumps(params, indent=2)}")
+        # %-style args defer formatting until a handler emits the record
+        self.logger.debug("[%s] Tool call: %s", task_id, tool_name)
+        self.logger.debug("  Parameters: %s", _LazyJson(params))
 
     def log_task_completed(
         self,
@@ -87,11 +134,26 @@ class NightShiftLogger:
 
     def log_agent_output(self, task_id: str, output: str):
         """Log raw agent output for debugging"""
-        log_file = self.log_dir / f"task_{task_id}_output.log"
-        with open(log_file, "a") as f:
-            f.write(f"[{datetime.now().isoformat()}]\n")
-            f.write(output)
-            f.write("\n---\n")
+        f = self._agent_files.get(task_id)
+        if f is None:
+            log_file = self.log_dir / f"task_{task_id}_output.log"
+            f = self._agent_files[task_id] = open(log_file, "a")
+        f.write(f"[{datetime.now().isoformat()}]\n")
+        f.write(output)
+        f.write("\n---\n")
+        # Keep the file readable (e.g. with tail -f) while the task runs
+        f.flush()
+
+    def close_task(self, task_id: str):
+        """Close the agent output file for a finished task"""
+        f = self._agent_files.pop(task_id, None)
+        if f is not None:
+            f.close()
+
+    def close(self):
+        """Close all open agent output files"""
+        for task_id in list(self._agent_files):
+            self.close_task(task_id)
 
     def info(self, message: str):
         """Generic info log"""
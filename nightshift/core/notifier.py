@@ -3,16 +3,33 @@ Notification System - Sends notifications about task completion
 Supports multiple backends (terminal, file, Slack, email - to be added)
 """
 import json
+import os
+import string
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
 
 from .file_tracker import FileChange
 
 
+# Markdown templates for terminal notifications
+_TERMINAL_HEADER = string.Template(
+    "## $emoji Task Completed: $task_id\n\n"
+    "**Description:** $description...\n\n"
+    "**Status:** [$color]$status[/$color]\n\n"
+    "**Execution Time:** ${execution_time}s\n\n"
+)
+_TERMINAL_SECTION = string.Template("**$label ($count):**\n$items\n")
+
+# (file_changes key, heading, list marker) in display order
+_TERMINAL_CHANGE_SECTIONS = (
+    ("created", "Created", "✨ "),
+    ("modified", "Modified", "✏️  "),
+    ("deleted", "Deleted", "🗑️  "),
+)
+
+
 class Notifier:
     """Handles notifications for task completion"""
 
@@ -25,11 +42,16 @@ class Notifier:
     ):
         self.notification_dir = Path(notification_dir)
         self.notification_dir.mkdir(parents=True, exist_ok=True)
-        self.console = Console()
         self.slack_client = slack_client
         self.slack_metadata = slack_metadata_store
         self.enable_terminal_output = enable_terminal_output
 
+        # Only pay for rich when something will actually be printed
+        self.console = None
+        if enable_terminal_output:
+            from rich.console import Console
+            self.console = Console()
+
     def generate_summary(
         self,
         task_id: str,
@@ -43,6 +65,11 @@ class Notifier:
     ) -> Dict[str, Any]:
         """Generate a comprehensive task completion summary"""
 
+        # Bucket changes by type in a single pass
+        buckets = defaultdict(list)
+        for change in file_changes:
+            buckets[change.change_type].append(change.path)
+
         summary = {
             "task_id": task_id,
             "description": task_description,
@@ -51,9 +78,9 @@ class Notifier:
             "execution_time": execution_time,
             "token_usage": token_usage,
             "file_changes": {
-                "created": [f.path for f in file_changes if f.change_type == 'created'],
-                "modified": [f.path for f in file_changes if f.change_type == 'modified'],
-                "deleted": [f.path for f in file_changes if f.change_type == 'deleted']
+                "created": buckets["created"],
+                "modified": buckets["modified"],
+                "deleted": buckets["deleted"]
             },
             "error_message": error_message,
             "result_path": result_path
@@ -104,68 +131,79 @@ class Notifier:
         """Save notification to file"""
         notification_file = self.notification_dir / f"{summary['task_id']}_notification.json"
 
-        with open(notification_file, "w") as f:
-            json.dump(summary, f, indent=2)
+        # Compact output unless pretty-printing is requested for debugging
+        if os.environ.get("NIGHTSHIFT_PRETTY_JSON"):
+            encoded = json.dumps(summary, indent=2)
+        else:
+            encoded = json.dumps(summary, separators=(",", ":"))
+
+        # Encode once and write the whole buffer in a single call
+        notification_file.write_text(encoded, encoding="utf-8")
 
     def _display_terminal(self, summary: Dict[str, Any]):
         """Display notification in terminal"""
         # Skip terminal output if disabled (e.g., when running in TUI mode)
-        if not self.enable_terminal_output:
+        if not self.enable_terminal_output or self.console is None:
             return
 
+        notification_text = self._format_terminal(summary)
+
+        # Only parse Markdown when it will be rendered to a real terminal
+        if self.console.is_terminal:
+            from rich.markdown import Markdown
+            body = Markdown(notification_text)
+        else:
+            body = notification_text
+
+        # Display as panel
+        self.console.print("\n")
+        self.console.print("=" * 80)
+        # Plain text may hold brackets (paths, error messages) that are not Rich markup
+        self.console.print(body, markup=False)
+        self.console.print("=" * 80)
+        self.console.print("\n")
+
+    def _format_terminal(self, summary: Dict[str, Any]) -> str:
+        """Build the Markdown text for a terminal notification"""
         status_emoji = "✅" if summary["status"] == "success" else "❌"
         status_color = "green" if summary["status"] == "success" else "red"
 
         # Build notification text
-        notification_text = f"## {status_emoji} Task Completed: {summary['task_id']}\n\n"
-        notification_text += f"**Description:** {summary['description'][:100]}...\n\n"
-        notification_text += f"**Status:** [{status_color}]{summary['status'].upper()}[/{status_color}]\n\n"
-        notification_text += f"**Execution Time:** {summary['execution_time']:.1f}s\n\n"
+        parts = [_TERMINAL_HEADER.substitute(
+            emoji=status_emoji,
+            task_id=summary['task_id'],
+            description=summary['description'][:100],
+            color=status_color,
+            status=summary['status'].upper(),
+            execution_time=f"{summary['execution_time']:.1f}",
+        )]
 
         if summary['token_usage']:
-            notification_text += f"**Token Usage:** {summary['token_usage']}\n\n"
+            parts.append(f"**Token Usage:** {summary['token_usage']}\n\n")
 
         # File changes
         file_changes = summary['file_changes']
         if any(file_changes.values()):
-            notification_text += "### File Changes\n\n"
-
-            if file_changes['created']:
-                notification_text += f"**Created ({len(file_changes['created'])}):**\n"
-                for f in file_changes['created'][:5]:
-                    notification_text += f"- ✨ {f}\n"
-                if len(file_changes['created']) > 5:
-                    notification_text += f"- ... and {len(file_changes['created']) - 5} more\n"
-                notification_text += "\n"
-
-            if file_changes['modified']:
-                notification_text += f"**Modified ({len(file_changes['modified'])}):**\n"
-                for f in file_changes['modified'][:5]:
-                    notification_text += f"- ✏️  {f}\n"
-                if len(file_changes['modified']) > 5:
-                    notification_text += f"- ... and {len(file_changes['modified']) - 5} more\n"
-                notification_text += "\n"
-
-            if file_changes['deleted']:
-                notification_text += f"**Deleted ({len(file_changes['deleted'])}):**\n"
-                for f in file_changes['deleted'][:5]:
-                    notification_text += f"- 🗑️  {f}\n"
-                if len(file_changes['deleted']) > 5:
-                    notification_text += f"- ... and {len(file_changes['deleted']) - 5} more\n"
-                notification_text += "\n"
+            parts.append("### File Changes\n\n")
+
+            for key, label, marker in _TERMINAL_CHANGE_SECTIONS:
+                paths = file_changes[key]
+                if not paths:
+                    continue
+                items = "".join(f"- {marker}{f}\n" for f in paths[:5])
+                if len(paths) > 5:
+                    items += f"- ... and {len(paths) - 5} more\n"
+                parts.append(_TERMINAL_SECTION.substitute(
+                    label=label, count=len(paths), items=items
+                ))
 
         if summary['error_message']:
-            notification_text += f"\n**Error:** {summary['error_message']}\n"
+            parts.append(f"\n**Error:** {summary['error_message']}\n")
 
         if summary['result_path']:
-            notification_text += f"\n**Results:** {summary['result_path']}\n"
+            parts.append(f"\n**Results:** {summary['result_path']}\n")
 
-        # Display as panel
-        self.console.print("\n")
-        self.console.print("=" * 80)
-        self.console.print(Markdown(notification_text))
-        self.console.print("=" * 80)
-        self.console.print("\n")
+        return "".join(parts)
 
     def _send_slack(self, summary: Dict[str, Any]):
         """Send notification to Slack"""
@@ -4,19 +4,113 @@ Uses sandbox-exec to enforce filesystem write restrictions
 """
 
 import os
+import hashlib
 import tempfile
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Full profile text; {files}, {git_block} and {dirs} are filled per profile
+# macOS sandbox: Start with (deny default) then allow specific operations
+_PROFILE_FMT = r"""(version 1)
+
+;; Deny everything by default
+(deny default)
+
+;; Allow process execution and basic operations
+(allow process*)
+
+;; Allow reading all files
+(allow file-read*)
+
+;; Allow mach and sysctl operations
+(allow mach-lookup)
+(allow sysctl*)
+(allow system-socket)
+(allow ipc-posix-shm)
+(allow mach*)
+
+;; Allow network access
+(allow network*)
+(allow network-outbound (remote tcp))
+
+;; Allow writes to specific files{files}
+
+;; Allow Keychain access for Claude CLI authentication
+(allow mach-lookup (global-name "com.apple.SecurityServer"))
+(allow mach-lookup (global-name "com.apple.securityd"))
+(allow mach-lookup (global-name "com.apple.system.opendirectoryd.libinfo"))
+(allow mach-lookup (global-name "com.apple.CoreServices.coreservicesd"))
+(allow ipc-posix-shm-read-data (ipc-posix-name-regex #"^/tmp/com\.apple\.csseed\."))
+(allow ipc-posix-shm-read* (ipc-posix-name "apple.shm.notification_center"))
+(allow ipc-posix-shm-read* (ipc-posix-name-regex #"^apple\."))
+(allow authorization-right-obtain)
+(allow user-preference-read)
+
+;; Allow standard device files for subprocess/logging
+(allow file-write* (literal "/dev/null"))
+(allow file-write* (literal "/dev/stdout"))
+(allow file-write* (literal "/dev/stderr"))
+(allow file-write* (literal "/dev/dtracehelper")){git_block}
+
+;; Allow writes to specified directories{dirs}"""
+
+# Additional network services for gh CLI (HTTPS/SSH)
+_PROFILE_GIT_BLOCK = """
+
+;; Allow additional network services for gh CLI (HTTPS/SSH)
+(allow mach-lookup (global-name "com.apple.dnssd.service"))
+(allow mach-lookup (global-name "com.apple.trustd"))
+(allow mach-lookup (global-name "com.apple.nsurlsessiond"))"""
+
+
+@cache
+def _home_dir() -> Path:
+    """Return the user's home directory, resolved once per process"""
+    return Path.home()
+
+
+# Directories that must never be writable - include both direct and
+# macOS /private/* variants
+_DANGEROUS_PATHS = frozenset({
+    "/", "/private",
+    "/etc", "/private/etc",
+    "/var", "/private/var",
+    "/bin", "/usr", "/sbin",
+    "/System", "/Library",
+    "/Applications", "/Volumes"
+})
+
+# Children of dangerous paths, checked with a single str.startswith call
+# ("/" is excluded, otherwise every absolute path would match)
+_DANGEROUS_PREFIXES = tuple(sorted(p + "/" for p in _DANGEROUS_PATHS if p != "/"))
+
+
+@lru_cache(maxsize=64)
+def _render_profile(
+    allowed_files: Tuple[str, ...],
+    allowed_dirs: Tuple[str, ...],
+    needs_git: bool,
+) -> str:
+    """Render sandbox profile text for sorted file/directory allow-lists"""
+    return _PROFILE_FMT.format(
+        files="".join(f'\n(allow file-write* (literal "{f}"))' for f in allowed_files),
+        git_block=_PROFILE_GIT_BLOCK if needs_git else "",
+        dirs="".join(f'\n(allow file-write* (subpath "{d}"))' for d in allowed_dirs),
+    )
+
+
 class SandboxManager:
     """Manages macOS sandbox-exec profile generation and execution"""
 
     def __init__(self):
-        self._temp_profiles = []
+        self._temp_profiles: Set[str] = set()
+        # Content digest -> profile path, so identical profiles share a file
+        self._profile_cache: Dict[str, str] = {}
 
     def create_profile(
         self,
@@ -53,103 +147,50 @@ class SandboxManager:
                 logger.warning(f"Allowed directory does not exist: {path}")
             resolved_dirs.append(str(path))
 
+        home = _home_dir()
+
         # Always allow temp directories and Claude's config/debug directories
         temp_dirs = [
             "/tmp",
             "/private/tmp",
             "/private/var/tmp",
             str(Path(tempfile.gettempdir()).resolve()),
-            str(Path.home() / ".claude"),  # Claude CLI needs to write debug logs and session data
+            str(home / ".claude"),  # Claude CLI needs to write debug logs and session data
         ]
 
         # Specific files that need write access (not directories)
         # These are typically credentials/config files that tools need to update
         allowed_files = [
-            str(Path.home() / ".claude.json"),  # Claude CLI config file
-            str(Path.home() / ".google_calendar_credentials.json"),  # Google Calendar credentials
-            str(Path.home() / ".google_calendar_token.json"),  # Google Calendar OAuth token
+            str(home / ".claude.json"),  # Claude CLI config file
+            str(home / ".google_calendar_credentials.json"),  # Google Calendar credentials
+            str(home / ".google_calendar_token.json"),  # Google Calendar OAuth token
         ]
 
         # Add gh and git config directories if git operations are needed
         if needs_git:
-            gh_config_dir = str(Path.home() / ".config" / "gh")
+            gh_config_dir = str(home / ".config" / "gh")
             if Path(gh_config_dir).exists():
                 temp_dirs.append(gh_config_dir)  # gh CLI needs to write tokens/cache
 
-            git_config_file = str(Path.home() / ".gitconfig")
+            git_config_file = str(home / ".gitconfig")
             if Path(git_config_file).exists():
                 allowed_files.append(git_config_file)  # git may need to update config
 
         # Combine and deduplicate
         all_allowed_dirs = list(set(resolved_dirs + temp_dirs))
 
-        # Generate profile content
-        # macOS sandbox: Start with (deny default) then allow specific operations
-        profile_lines = [
-            "(version 1)",
-            "",
-            ";; Deny everything by default",
-            "(deny default)",
-            "",
-            ";; Allow process execution and basic operations",
-            "(allow process*)",
-            "",
-            ";; Allow reading all files",
-            "(allow file-read*)",
-            "",
-            ";; Allow mach and sysctl operations",
-            "(allow mach-lookup)",
-            "(allow sysctl*)",
-            "(allow system-socket)",
-            "(allow ipc-posix-shm)",
-            "(allow mach*)",
-            "",
-            ";; Allow network access",
-            "(allow network*)",
-            "(allow network-outbound (remote tcp))",
-            "",
-            ";; Allow writes to specific files",
-        ]
-
-        for file_path in sorted(allowed_files):
-            profile_lines.append(f'(allow file-write* (literal "{file_path}"))')
-
-        # Keychain access (required for Claude CLI authentication)
-        profile_lines.append("")
-        profile_lines.append(";; Allow Keychain access for Claude CLI authentication")
-        profile_lines.append('(allow mach-lookup (global-name "com.apple.SecurityServer"))')
-        profile_lines.append('(allow mach-lookup (global-name "com.apple.securityd"))')
-        profile_lines.append('(allow mach-lookup (global-name "com.apple.system.opendirectoryd.libinfo"))')
-        profile_lines.append('(allow mach-lookup (global-name "com.apple.CoreServices.coreservicesd"))')
-        profile_lines.append('(allow ipc-posix-shm-read-data (ipc-posix-name-regex #"^/tmp/com\\.apple\\.csseed\\."))')
-        profile_lines.append('(allow ipc-posix-shm-read* (ipc-posix-name "apple.shm.notification_center"))')
-        profile_lines.append('(allow ipc-posix-shm-read* (ipc-posix-name-regex #"^apple\\."))')
-        profile_lines.append('(allow authorization-right-obtain)')
-        profile_lines.append('(allow user-preference-read)')
-
-        # Always allow standard device files (needed by MCP servers and git)
-        profile_lines.append("")
-        profile_lines.append(";; Allow standard device files for subprocess/logging")
-        profile_lines.append('(allow file-write* (literal "/dev/null"))')
-        profile_lines.append('(allow file-write* (literal "/dev/stdout"))')
-        profile_lines.append('(allow file-write* (literal "/dev/stderr"))')
-        profile_lines.append('(allow file-write* (literal "/dev/dtracehelper"))')
-
-        # Add additional network services if needed for git/gh
-        if needs_git:
-            profile_lines.append("")
-            profile_lines.append(";; Allow additional network services for gh CLI (HTTPS/SSH)")
-            profile_lines.append('(allow mach-lookup (global-name "com.apple.dnssd.service"))')
-            profile_lines.append('(allow mach-lookup (global-name "com.apple.trustd"))')
-            profile_lines.append('(allow mach-lookup (global-name "com.apple.nsurlsessiond"))')
-
-        profile_lines.append("")
-        profile_lines.append(";; Allow writes to specified directories")
-
-        for allowed_path in sorted(all_allowed_dirs):
-            profile_lines.append(f'(allow file-write* (subpath "{allowed_path}"))')
+        profile_content = _render_profile(
+            tuple(sorted(allowed_files)),
+            tuple(sorted(all_allowed_dirs)),
+            needs_git,
+        )
 
-        profile_content = "\n".join(profile_lines)
+        # Reuse an existing profile file with identical content
+        key = hashlib.blake2b(profile_content.encode(), digest_size=16).hexdigest()
+        cached_path = self._profile_cache.get(key)
+        if cached_path and os.path.exists(cached_path):
+            logger.debug(f"Reusing sandbox profile: {cached_path}")
+            return cached_path
 
         # Write to temporary file
         fd, profile_path = tempfile.mkstemp(
@@ -161,7 +202,8 @@ class SandboxManager:
         with os.fdopen(fd, "w") as f:
             f.write(profile_content)
 
-        self._temp_profiles.append(profile_path)
+        self._temp_profiles.add(profile_path)
+        self._profile_cache[key] = profile_path
 
         logger.info(f"Created sandbox profile: {profile_path}")
         logger.debug(f"Allowed directories: {', '.join(resolved_dirs)}")
@@ -199,22 +241,32 @@ class SandboxManager:
 
     def cleanup(self):
         """Remove all temporary profile files"""
-        for profile_path in self._temp_profiles:
+        for profile_path in list(self._temp_profiles):
             try:
                 os.unlink(profile_path)
                 logger.debug(f"Cleaned up profile: {profile_path}")
+            except FileNotFoundError:
+                # Already removed - nothing to do
+                pass
             except Exception as e:
                 logger.warning(f"Failed to cleanup profile {profile_path}: {e}")
 
         self._temp_profiles.clear()
+        self._profile_cache.clear()
 
     def __del__(self):
         """Cleanup profiles on deletion"""
         self.cleanup()
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def is_available() -> bool:
-        """Check if sandbox-exec is available on this system"""
+        """
+        Check if sandbox-exec is available on this system
+
+        The result is cached for the life of the process; call
+        SandboxManager.is_available.cache_clear() to re-check.
+        """
         import shutil
         return shutil.which("sandbox-exec") is not None
 
@@ -234,29 +286,18 @@ class SandboxManager:
         """
         validated = []
 
-        # Dangerous paths - include both direct and macOS /private/* variants
-        dangerous_paths = [
-            "/", "/private",
-            "/etc", "/private/etc",
-            "/var", "/private/var",
-            "/bin", "/usr", "/sbin",
-            "/System", "/Library",
-            "/Applications", "/Volumes"
-        ]
-
         for dir_path in directories:
             path = Path(dir_path).resolve()
             path_str = str(path)
 
             # Check for dangerous paths (exact match or child of dangerous path)
-            for dangerous in dangerous_paths:
-                if path_str == dangerous or path_str.startswith(dangerous + "/"):
-                    raise ValueError(
-                        f"Refusing to allow writes to system directory: {path_str}"
-                    )
+            if path_str in _DANGEROUS_PATHS or path_str.startswith(_DANGEROUS_PREFIXES):
+                raise ValueError(
+                    f"Refusing to allow writes to system directory: {path_str}"
+                )
 
             # Warn about home directory
-            if path == Path.home():
+            if path == _home_dir():
                 logger.warning(
                     f"Allowing writes to entire home directory: {path_str}. "
                     "Consider using a more specific subdirectory."
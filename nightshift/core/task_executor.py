@@ -8,8 +8,9 @@ import signal
 import sys
 import os
 import json
-from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Dict, Optional, Set
+from concurrent.futures import ThreadPoolExecutor, Future, wait as wait_futures
+from functools import partial
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
 from .task_queue import TaskQueue, Task, TaskStatus
@@ -17,6 +18,68 @@ from .agent_manager import AgentManager
 from .logger import NightShiftLogger
 
 
+# Shortest wait between polls; the interval grows towards poll_interval while idle
+MIN_POLL_INTERVAL = 0.05
+# Growth factor applied to the poll interval after each empty poll
+POLL_BACKOFF = 1.5
+# How long ExecutorManager reuses a PID-file liveness check (seconds)
+STATUS_CACHE_TTL = 0.5
+
+
+def _short_pid_path(pid_file: Path) -> Path:
+    """Sidecar next to the PID file holding just the PID"""
+    return pid_file.with_name(pid_file.name + ".short")
+
+
+def _read_pid(pid_file: Path) -> int:
+    """
+    Read the executor PID for a liveness check
+
+    Reads the one-line sidecar when present and falls back to parsing the
+    JSON PID file (e.g. one written by an older version).
+
+    Raises:
+        ValueError, KeyError, FileNotFoundError: If no valid PID can be read
+    """
+    try:
+        with open(_short_pid_path(pid_file)) as f:
+            return int(f.read(16))
+    except (FileNotFoundError, ValueError):
+        pass
+    return _load_pid_data(pid_file)["pid"]
+
+
+def _is_pid_alive(pid: int) -> bool:
+    """Return True if a process with this PID exists (signal 0 probe)"""
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def _load_pid_data(pid_file: Path) -> Dict:
+    """Parse the JSON PID file from a single bytes read"""
+    return json.loads(pid_file.read_bytes())
+
+
+def _write_atomic(path: Path, text: str):
+    """Write text via a temp file and rename, so readers never see a partial file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _remove_pid_file(pid_file: Path):
+    """Remove the PID file and its sidecar"""
+    pid_file.unlink()
+    _short_pid_path(pid_file).unlink(missing_ok=True)
+
+
 class TaskExecutor:
     """
     Background service that polls for COMMITTED tasks and executes them concurrently
@@ -33,7 +96,8 @@ class TaskExecutor:
         logger: NightShiftLogger,
         max_workers: int = 3,
         poll_interval: float = 1.0,
-        pid_file: Optional[Path] = None
+        pid_file: Optional[Path] = None,
+        executor: Optional[ThreadPoolExecutor] = None
     ):
         """
         Initialize task executor
@@ -45,6 +109,8 @@ class TaskExecutor:
             max_workers: Maximum number of concurrent task executions
             poll_interval: How often to poll for new tasks (seconds)
             pid_file: Path to PID file for tracking executor state
+            executor: Optional thread pool to run tasks on. An injected pool
+                is owned by the caller and is not shut down by stop()
         """
         self.task_queue = task_queue
         self.agent_manager = agent_manager
@@ -53,11 +119,15 @@ class TaskExecutor:
         self.poll_interval = poll_interval
         self.pid_file = pid_file or Path.home() / ".nightshift" / "executor.pid"
 
-        # Thread pool for concurrent task execution
-        self.executor = ThreadPoolExecutor(
-            max_workers=max_workers,
-            thread_name_prefix="nightshift-worker"
-        )
+        # Adaptive polling: start fast, back off geometrically while idle,
+        # never exceeding poll_interval
+        self._min_poll = min(MIN_POLL_INTERVAL, poll_interval)
+        self._max_poll = poll_interval
+        self._cur_poll = self._min_poll
+
+        # Thread pool for concurrent task execution, created on first use
+        self._owns_executor = executor is None
+        self._executor = executor
 
         # Track running tasks
         self.running_tasks: Dict[str, Future] = {}  # task_id -> Future
@@ -65,6 +135,10 @@ class TaskExecutor:
 
         # Control flags
         self.shutdown_event = threading.Event()
+        # Set after every poll iteration (see wait_for_iteration)
+        self._iteration_done = threading.Event()
+        # Set to cut the current poll wait short (see wake)
+        self._wake = threading.Event()
         self.poll_thread: Optional[threading.Thread] = None
         self.is_running = False
 
@@ -77,28 +151,25 @@ class TaskExecutor:
         # Check for existing PID file (another executor may be running)
         if self.pid_file.exists():
             try:
-                with open(self.pid_file) as f:
-                    existing_pid_data = json.load(f)
-                existing_pid = existing_pid_data["pid"]
+                existing_pid = _read_pid(self.pid_file)
 
                 # Check if process is still alive
-                try:
-                    os.kill(existing_pid, 0)
+                if _is_pid_alive(existing_pid):
                     # Process is alive - another executor is running
                     raise RuntimeError(
                         f"Another executor is already running (PID {existing_pid}). "
                         f"Stop it first with 'nightshift executor stop' or kill process {existing_pid}"
                     )
-                except OSError:
-                    # Process is dead - stale PID file, clean it up
-                    self.logger.warning(f"Found stale PID file (PID {existing_pid} not running), removing it")
-                    self.pid_file.unlink()
 
-            except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
+                # Process is dead - stale PID file, clean it up
+                self.logger.warning(f"Found stale PID file (PID {existing_pid} not running), removing it")
+                _remove_pid_file(self.pid_file)
+
+            except (ValueError, KeyError, FileNotFoundError) as e:
                 # Corrupted or invalid PID file, clean it up
                 self.logger.warning(f"Found invalid PID file, removing it: {e}")
                 try:
-                    self.pid_file.unlink()
+                    _remove_pid_file(self.pid_file)
                 except:
                     pass
 
@@ -106,6 +177,8 @@ class TaskExecutor:
 
         self.is_running = True
         self.shutdown_event.clear()
+        self._wake.clear()
+        self._cur_poll = self._min_poll
 
         # Write PID file for cross-process visibility
         try:
@@ -116,8 +189,9 @@ class TaskExecutor:
                 "started_at": time.time()
             }
             self.pid_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.pid_file, 'w') as f:
-                json.dump(pid_data, f)
+            _write_atomic(self.pid_file, json.dumps(pid_data, separators=(",", ":")))
+            # Liveness checks only need the PID, so keep it in a sidecar too
+            _write_atomic(_short_pid_path(self.pid_file), f"{pid_data['pid']}\n")
             self.logger.debug(f"PID file written to {self.pid_file}")
         except Exception as e:
             self.logger.error(f"Failed to write PID file: {e}")
@@ -156,6 +230,7 @@ class TaskExecutor:
 
         # Signal shutdown
         self.shutdown_event.set()
+        self._wake.set()
 
         # Wait for poll thread to exit
         if self.poll_thread and self.poll_thread.is_alive():
@@ -163,12 +238,19 @@ class TaskExecutor:
 
         # Shutdown executor (waits for running tasks)
         self.logger.info(f"Waiting up to {timeout}s for {len(self.running_tasks)} running tasks to complete...")
-        self.executor.shutdown(wait=True, cancel_futures=False)
+        if self._owns_executor:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=False)
+        else:
+            # Shared pool - only wait for our own tasks
+            with self.running_lock:
+                pending = list(self.running_tasks.values())
+            wait_futures(pending, timeout=timeout)
 
         # Remove PID file
         try:
             if self.pid_file.exists():
-                self.pid_file.unlink()
+                _remove_pid_file(self.pid_file)
                 self.logger.debug(f"PID file removed: {self.pid_file}")
         except Exception as e:
             self.logger.error(f"Failed to remove PID file: {e}")
@@ -176,6 +258,33 @@ class TaskExecutor:
         self.is_running = False
         self.logger.info("Task executor stopped")
 
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool tasks run on; an owned pool is created on first access"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="nightshift-worker"
+            )
+        return self._executor
+
+    def wake(self):
+        """Make the poll loop check for tasks now instead of after its current wait"""
+        self._wake.set()
+
+    def wait_for_iteration(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the poll loop completes its next iteration
+
+        Args:
+            timeout: Maximum time to wait (seconds)
+
+        Returns:
+            True if an iteration completed, False on timeout
+        """
+        self._iteration_done.clear()
+        return self._iteration_done.wait(timeout)
+
     def get_status(self) -> Dict:
         """
         Get executor status
@@ -204,25 +313,33 @@ class TaskExecutor:
                 with self.running_lock:
                     current_running = len(self.running_tasks)
 
-                if current_running < self.max_workers:
-                    # Try to acquire a task
-                    task = self.task_queue.acquire_task_for_execution()
+                tasks = []
+                free_slots = self.max_workers - current_running
+                if free_slots > 0:
+                    # Fill every free worker in one round-trip
+                    tasks = self.task_queue.acquire_tasks_for_execution(free_slots)
 
-                    if task:
-                        self.logger.info(f"Acquired task {task.task_id} for execution")
-                        self._submit_task(task)
-                    # else: No COMMITTED tasks available, continue polling
+                    if tasks:
+                        self._submit_tasks(tasks)
+                    # No tasks means nothing is COMMITTED, continue polling
 
-                # Clean up completed tasks
-                self._cleanup_completed_tasks()
+                # Poll again quickly after work arrives, back off while idle
+                if tasks:
+                    self._cur_poll = self._min_poll
+                else:
+                    self._cur_poll = min(self._cur_poll * POLL_BACKOFF, self._max_poll)
 
-                # Sleep before next poll
-                self.shutdown_event.wait(self.poll_interval)
+                self._iteration_done.set()
+
+                # Sleep before next poll; wake() and stop() cut this short
+                self._wake.wait(self._cur_poll)
+                self._wake.clear()
 
             except Exception as e:
                 self.logger.error(f"Error in poll loop: {e}")
                 # Continue polling even after errors
-                self.shutdown_event.wait(self.poll_interval)
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
 
         self.logger.info("Poll loop exited")
 
@@ -233,25 +350,54 @@ class TaskExecutor:
         Args:
             task: Task to execute
         """
-        # Submit to thread pool
-        future = self.executor.submit(self._execute_task_wrapper, task.task_id)
+        self._submit_tasks([task])
+
+    def _submit_tasks(self, tasks: List[Task]):
+        """
+        Submit a batch of tasks to the executor thread pool
+
+        Futures are registered under a single acquisition of running_lock
+        rather than one per task.
+
+        Args:
+            tasks: Tasks to execute
+        """
+        futures = []
+        for task in tasks:
+            self.logger.info(f"Acquired task {task.task_id} for execution")
+            futures.append((task.task_id, self.executor.submit(self._execute_task_wrapper, task.task_id, task)))
 
-        # Track the future
+        # Track the futures
         with self.running_lock:
-            self.running_tasks[task.task_id] = future
+            self.running_tasks.update(futures)
+            busy = len(self.running_tasks)
 
-        self.logger.info(f"Task {task.task_id} submitted to executor ({len(self.running_tasks)}/{self.max_workers} workers busy)")
+        for task_id, future in futures:
+            self.logger.info(f"Task {task_id} submitted to executor ({busy}/{self.max_workers} workers busy)")
+            # Registered outside running_lock: an already-finished future
+            # runs the callback immediately in this thread
+            future.add_done_callback(partial(self._on_task_done, task_id))
 
-    def _execute_task_wrapper(self, task_id: str):
+    def _on_task_done(self, task_id: str, future: Future):
+        """Stop tracking a task once its future completes (runs in worker thread)"""
+        with self.running_lock:
+            # Ignore if the slot was already reused for a resubmitted task
+            if self.running_tasks.get(task_id) is future:
+                del self.running_tasks[task_id]
+
+    def _execute_task_wrapper(self, task_id: str, task: Optional[Task] = None):
         """
         Wrapper for executing task (runs in worker thread)
 
         Args:
             task_id: ID of task to execute
+            task: Task as returned by acquisition; re-read from the queue if omitted
         """
         try:
-            # Get fresh task data
-            task = self.task_queue.get_task(task_id)
+            # Acquisition already returns fresh task data, so only hit the
+            # database when called without it
+            if task is None:
+                task = self.task_queue.get_task(task_id)
             if not task:
                 self.logger.error(f"Task {task_id} not found in queue")
                 return
@@ -281,7 +427,12 @@ class TaskExecutor:
                 pass
 
     def _cleanup_completed_tasks(self):
-        """Remove completed futures from tracking"""
+        """
+        Remove completed futures from tracking
+
+        Submitted tasks untrack themselves via _on_task_done, so the poll
+        loop no longer calls this; it remains as a manual sweep.
+        """
         with self.running_lock:
             completed_tasks = [
                 task_id for task_id, future in self.running_tasks.items()
@@ -305,6 +456,8 @@ class ExecutorManager:
 
     _instance: Optional[TaskExecutor] = None
     _lock = threading.Lock()
+    # (PID file (mtime_ns, size), expiry, status) from the last liveness check
+    _status_cache: Optional[Tuple[Tuple[int, int], float, Dict]] = None
 
     @classmethod
     def start_executor(
@@ -328,7 +481,15 @@ class ExecutorManager:
         Returns:
             TaskExecutor instance
         """
+        # Fast path: reading the attribute is atomic, so an already-running
+        # instance can be returned without taking the lock
+        instance = cls._instance
+        if instance is not None and instance.is_running:
+            logger.warning("Executor already running")
+            return instance
+
         with cls._lock:
+            # Re-check under the lock in case another thread started it
             if cls._instance and cls._instance.is_running:
                 logger.warning("Executor already running")
                 return cls._instance
@@ -349,6 +510,8 @@ class ExecutorManager:
     def stop_executor(cls, timeout: float = 30.0):
         """Stop the global executor instance (or executor in another process)"""
         with cls._lock:
+            cls._status_cache = None
+
             # First try to stop local instance
             if cls._instance:
                 cls._instance.stop(timeout=timeout)
@@ -358,40 +521,36 @@ class ExecutorManager:
             pid_file = Path.home() / ".nightshift" / "executor.pid"
             if pid_file.exists():
                 try:
-                    with open(pid_file) as f:
-                        pid_data = json.load(f)
-                    pid = pid_data["pid"]
+                    pid = _read_pid(pid_file)
 
                     # Check if process is alive
-                    try:
-                        os.kill(pid, 0)
+                    if _is_pid_alive(pid):
                         # Process is alive - send SIGTERM for graceful shutdown
-                        os.kill(pid, signal.SIGTERM)
-
-                        # Wait a bit for graceful shutdown
-                        import time
-                        time.sleep(2)
-
-                        # Check if it stopped
                         try:
-                            os.kill(pid, 0)
-                            # Still running - warn user
-                            raise RuntimeError(
-                                f"Executor process {pid} did not stop gracefully. "
-                                f"You may need to manually kill it: kill {pid}"
-                            )
+                            os.kill(pid, signal.SIGTERM)
                         except OSError:
-                            # Process stopped, clean up PID file
-                            pid_file.unlink()
-
-                    except OSError:
-                        # Process already dead, clean up PID file
-                        pid_file.unlink()
-
-                except (json.JSONDecodeError, KeyError, FileNotFoundError):
+                            # Exited between the check and the signal
+                            pass
+                        else:
+                            # Wait a bit for graceful shutdown
+                            import time
+                            time.sleep(2)
+
+                            # Check if it stopped
+                            if _is_pid_alive(pid):
+                                # Still running - warn user
+                                raise RuntimeError(
+                                    f"Executor process {pid} did not stop gracefully. "
+                                    f"You may need to manually kill it: kill {pid}"
+                                )
+
+                    # Process stopped (or was already dead), clean up PID file
+                    _remove_pid_file(pid_file)
+
+                except (ValueError, KeyError, FileNotFoundError):
                     # Invalid PID file, clean it up
                     try:
-                        pid_file.unlink()
+                        _remove_pid_file(pid_file)
                     except:
                         pass
 
@@ -412,16 +571,20 @@ class ExecutorManager:
             pid_file = Path.home() / ".nightshift" / "executor.pid"
             if pid_file.exists():
                 try:
-                    with open(pid_file) as f:
-                        pid_data = json.load(f)
+                    # Reuse a recent liveness check if the PID file is unchanged
+                    st = pid_file.stat()
+                    file_key = (st.st_mtime_ns, st.st_size)
+                    cached = cls._status_cache
+                    if cached and cached[0] == file_key and time.monotonic() < cached[1]:
+                        return dict(cached[2])
+
+                    pid_data = _load_pid_data(pid_file)
 
                     pid = pid_data["pid"]
 
                     # Check if process is still alive
-                    try:
-                        os.kill(pid, 0)  # Signal 0 doesn't kill, just checks if process exists
-                        # Process is alive
-                        return {
+                    if _is_pid_alive(pid):
+                        status = {
                             "is_running": True,
                             "max_workers": pid_data["max_workers"],
                             "running_tasks": "unknown",  # Can't know from other process
@@ -429,14 +592,18 @@ class ExecutorManager:
                             "poll_interval": pid_data["poll_interval"],
                             "pid": pid
                         }
-                    except OSError:
-                        # Process not found - stale PID file
-                        pid_file.unlink()
+                        cls._status_cache = (
+                            file_key, time.monotonic() + STATUS_CACHE_TTL, status
+                        )
+                        return dict(status)
+
+                    # Process not found - stale PID file
+                    _remove_pid_file(pid_file)
 
                 except (json.JSONDecodeError, KeyError, FileNotFoundError):
                     # Invalid or corrupted PID file, clean it up
                     try:
-                        pid_file.unlink()
+                        _remove_pid_file(pid_file)
                     except:
                         pass
 
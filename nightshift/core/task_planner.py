@@ -11,6 +11,92 @@ from typing import Dict, Any, List, Optional
 from .logger import NightShiftLogger
 from .mcp_config_manager import MCPConfigManager
 
+# Package config directory holding the default planner reference files
+_CONFIG_DIR = Path(__file__).parent.parent / "config"
+_DEFAULT_TOOLS_REFERENCE = _CONFIG_DIR / "claude-code-tools-reference.md"
+_DEFAULT_DIRECTORY_MAP = _CONFIG_DIR / "directory-map.md"
+
+# --json-schema arguments, serialized once
+_PLAN_SCHEMA = json.dumps(
+    {
+        "type": "object",
+        "properties": {
+            "enhanced_prompt": {"type": "string"},
+            "allowed_tools": {"type": "array", "items": {"type": "string"}},
+            "allowed_directories": {
+                "type": "array",
+                "items": {"type": "string"},
+            },
+            "needs_git": {"type": "boolean"},
+            "system_prompt": {"type": "string"},
+            "reasoning": {"type": "string"},
+        },
+        "required": [
+            "enhanced_prompt",
+            "allowed_tools",
+            "allowed_directories",
+            "needs_git",
+            "system_prompt",
+        ],
+    }
+)
+
+_REFINE_SCHEMA = json.dumps(
+    {
+        "type": "object",
+        "properties": {
+            "enhanced_prompt": {"type": "string"},
+            "allowed_tools": {"type": "array", "items": {"type": "string"}},
+            "allowed_directories": {
+                "type": "array",
+                "items": {"type": "string"},
+            },
+            "needs_git": {"type": "boolean"},
+            "system_prompt": {"type": "string"},
+            "estimated_tokens": {"type": "integer"},
+            "reasoning": {"type": "string"},
+        },
+        "required": [
+            "enhanced_prompt",
+            "allowed_tools",
+            "allowed_directories",
+            "needs_git",
+            "system_prompt",
+            "estimated_tokens",
+        ],
+    }
+)
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a surrounding ```json or ``` markdown fence, if present"""
+    if text.startswith("```json"):
+        # Strip ```json at start and ``` at end
+        text = text.replace("```json\n", "", 1)
+        text = text.rsplit("```", 1)[0]
+    elif text.startswith("```"):
+        text = text.replace("```\n", "", 1)
+        text = text.rsplit("```", 1)[0]
+    return text.strip()
+
+
+def _parse_plan_output(stdout: str) -> Dict[str, Any]:
+    """
+    Extract the plan from claude's --output-format json output
+
+    Raises:
+        json.JSONDecodeError: If the output or the embedded result is not JSON
+    """
+    wrapper = json.loads(stdout)
+
+    # Check for structured_output first (new --json-schema format)
+    if "structured_output" in wrapper:
+        return wrapper["structured_output"]
+    if wrapper.get("result"):
+        return json.loads(_strip_code_fence(wrapper["result"]))
+    # If no wrapper, try parsing directly
+    return wrapper
+
 
 class TaskPlanner:
     """Plans task execution using Claude to analyze requirements"""
@@ -33,28 +119,16 @@ class TaskPlanner:
 
         # Default to package's config directory
         if tools_reference_path is None:
-            # Get the directory where this module is installed
-            package_dir = Path(__file__).parent.parent
-            tools_reference_path = (
-                package_dir / "config" / "claude-code-tools-reference.md"
-            )
+            tools_reference_path = _DEFAULT_TOOLS_REFERENCE
 
         if directory_map_path is None:
-            package_dir = Path(__file__).parent.parent
-            directory_map_path = package_dir / "config" / "directory-map.md"
+            directory_map_path = _DEFAULT_DIRECTORY_MAP
 
         self.tools_reference_path = Path(tools_reference_path)
         self.directory_map_path = Path(directory_map_path)
 
         # Load tools reference (optional)
-        if self.tools_reference_path.exists():
-            with open(self.tools_reference_path) as f:
-                self.tools_reference = f.read()
-        else:
-            self.logger.warning(
-                f"Tools reference not found at {self.tools_reference_path}"
-            )
-            self.tools_reference = ""
+        self.tools_reference = self._load_tools_reference()
 
         # Load directory map (optional)
         if self.directory_map_path.exists():
@@ -67,6 +141,17 @@ class TaskPlanner:
             )
             self.directory_map = ""
 
+    def _load_tools_reference(self) -> str:
+        """Read the tools reference file, or return "" if it is missing"""
+        if self.tools_reference_path.exists():
+            with open(self.tools_reference_path) as f:
+                return f.read()
+
+        self.logger.warning(
+            f"Tools reference not found at {self.tools_reference_path}"
+        )
+        return ""
+
     def plan_task(self, description: str, timeout: int = 120) -> Dict[str, Any]:
         """
         Use Claude to analyze task and create execution plan
@@ -155,36 +240,12 @@ Guidelines:
         # Generate empty MCP config for planner (planner doesn't need MCP tools)
         empty_mcp_config = None
         try:
-            # Call Claude in headless mode for planning
-            # Use --json-schema to enforce structured output
-            json_schema = json.dumps(
-                {
-                    "type": "object",
-                    "properties": {
-                        "enhanced_prompt": {"type": "string"},
-                        "allowed_tools": {"type": "array", "items": {"type": "string"}},
-                        "allowed_directories": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                        },
-                        "needs_git": {"type": "boolean"},
-                        "system_prompt": {"type": "string"},
-                        "reasoning": {"type": "string"},
-                    },
-                    "required": [
-                        "enhanced_prompt",
-                        "allowed_tools",
-                        "allowed_directories",
-                        "needs_git",
-                        "system_prompt",
-                    ],
-                }
-            )
-
             # Create empty MCP config for planner (huge token savings!)
             empty_mcp_config = self.mcp_manager.get_empty_config(profile_name="planner")
             self.logger.info(f"Using empty MCP config for planner: {empty_mcp_config}")
 
+            # Call Claude in headless mode for planning
+            # Use --json-schema to enforce structured output
             cmd = [
                 self.claude_bin,
                 "-p",
@@ -192,7 +253,7 @@ Guidelines:
                 "--output-format",
                 "json",
                 "--json-schema",
-                json_schema,
+                _PLAN_SCHEMA,
                 "--mcp-config",
                 empty_mcp_config,
             ]
@@ -215,30 +276,7 @@ Guidelines:
             self.logger.debug(result.stdout[:500])
             self.logger.debug("=" * 60)
 
-            # Parse the wrapper JSON
-            wrapper = json.loads(result.stdout)
-
-            # Extract the actual result from the wrapper
-            # Check for structured_output first (new --json-schema format)
-            if "structured_output" in wrapper:
-                plan = wrapper["structured_output"]
-            elif "result" in wrapper and wrapper["result"]:
-                result_text = wrapper["result"]
-
-                # Remove markdown code fences if present
-                if result_text.startswith("```json"):
-                    # Strip ```json at start and ``` at end
-                    result_text = result_text.replace("```json\n", "", 1)
-                    result_text = result_text.rsplit("```", 1)[0]
-                elif result_text.startswith("```"):
-                    result_text = result_text.replace("```\n", "", 1)
-                    result_text = result_text.rsplit("```", 1)[0]
-
-                result_text = result_text.strip()
-                plan = json.loads(result_text)
-            else:
-                # If no wrapper, try parsing directly
-                plan = wrapper
+            plan = _parse_plan_output(result.stdout)
 
             # Validate required fields
             required_fields = [
@@ -351,38 +389,12 @@ Guidelines:
         # Generate empty MCP config for refinement (also doesn't need MCP tools)
         empty_mcp_config = None
         try:
-            # Call Claude in headless mode for plan refinement
-            json_schema = json.dumps(
-                {
-                    "type": "object",
-                    "properties": {
-                        "enhanced_prompt": {"type": "string"},
-                        "allowed_tools": {"type": "array", "items": {"type": "string"}},
-                        "allowed_directories": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                        },
-                        "needs_git": {"type": "boolean"},
-                        "system_prompt": {"type": "string"},
-                        "estimated_tokens": {"type": "integer"},
-                        "reasoning": {"type": "string"},
-                    },
-                    "required": [
-                        "enhanced_prompt",
-                        "allowed_tools",
-                        "allowed_directories",
-                        "needs_git",
-                        "system_prompt",
-                        "estimated_tokens",
-                    ],
-                }
-            )
-
             # Create empty MCP config for plan refinement
             empty_mcp_config = self.mcp_manager.get_empty_config(
                 profile_name="refine_planner"
             )
 
+            # Call Claude in headless mode for plan refinement
             cmd = [
                 self.claude_bin,
                 "-p",
@@ -390,7 +402,7 @@ Guidelines:
                 "--output-format",
                 "json",
                 "--json-schema",
-                json_schema,
+                _REFINE_SCHEMA,
                 "--mcp-config",
                 empty_mcp_config,
             ]
@@ -404,29 +416,7 @@ Guidelines:
                 self.logger.error(f"STDERR: {result.stderr}")
                 raise Exception(f"Plan refinement failed: {result.stderr}")
 
-            # Parse the wrapper JSON
-            wrapper = json.loads(result.stdout)
-
-            # Extract the actual result from the wrapper
-            # Check for structured_output first (new --json-schema format)
-            if "structured_output" in wrapper:
-                refined_plan = wrapper["structured_output"]
-            elif "result" in wrapper and wrapper["result"]:
-                result_text = wrapper["result"]
-
-                # Remove markdown code fences if present
-                if result_text.startswith("```json"):
-                    result_text = result_text.replace("```json\n", "", 1)
-                    result_text = result_text.rsplit("```", 1)[0]
-                elif result_text.startswith("```"):
-                    result_text = result_text.replace("```\n", "", 1)
-                    result_text = result_text.rsplit("```", 1)[0]
-
-                result_text = result_text.strip()
-                refined_plan = json.loads(result_text)
-            else:
-                # If no wrapper, try parsing directly
-                refined_plan = wrapper
+            refined_plan = _parse_plan_output(result.stdout)
 
             # Validate required fields (must match JSON schema)
             required_fields = ["enhanced_prompt", "allowed_tools", "allowed_directories",
@@ -4,12 +4,19 @@ Handles task creation, state transitions, and persistence
 """
 import sqlite3
 import json
+import threading
 from contextlib import contextmanager
+from functools import cache
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass, fields
+
+
+# Stored in PRAGMA user_version once _create_schema has run; bump it whenever
+# a migration is added so existing databases are brought up to date
+_SCHEMA_VERSION = 1
 
 
 class TaskStatus(Enum):
@@ -23,7 +30,7 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"     # User cancelled
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a research task"""
     task_id: str
@@ -47,17 +54,87 @@ class Task:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return asdict(self)
+        # Fields are flat, so copying the lists is all asdict's deep copy did
+        result = {}
+        for name in _TASK_FIELDS:
+            value = getattr(self, name)
+            result[name] = list(value) if isinstance(value, list) else value
+        return result
+
+
+# Looked up once rather than reflected on every to_dict call
+_TASK_FIELDS = tuple(f.name for f in fields(Task))
 
 
 class TaskQueue:
     """SQLite-backed task queue with state management (thread-safe)"""
 
-    def __init__(self, db_path: str = "database/nightshift.db"):
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_db()
-        self._enable_wal_mode()
+    def __init__(self, db_path: str = "database/nightshift.db", *, fast_unsafe: bool = False):
+        """
+        Args:
+            db_path: Path to the SQLite database file, or a "file:" URI
+                (e.g. "file:name?mode=memory&cache=shared" for an in-memory
+                database shared by every connection this queue opens).
+                Shared-cache table locks fail immediately instead of waiting
+                for the busy timeout, so in-memory queues suit single-writer
+                use such as tests.
+            fast_unsafe: Skip fsyncs and keep the rollback journal in memory
+                instead of using WAL. A crash can corrupt the database, so
+                only use this for throwaway databases such as in tests.
+        """
+        self._set_location(db_path, fast_unsafe)
+        if not self._is_prepared():
+            self._init_db()
+            self._enable_wal_mode()
+
+    @classmethod
+    def from_template(cls, db_path: str, *, fast_unsafe: bool = False) -> "TaskQueue":
+        """
+        Open a queue, copying the schema from a prebuilt in-memory template
+
+        The template is built once per process, so creating many fresh
+        databases (e.g. one per test) skips re-running the schema DDL and
+        migrations. Databases that already contain tables are opened
+        normally instead, since a backup would overwrite them.
+
+        Args:
+            db_path: Same as for TaskQueue()
+            fast_unsafe: Same as for TaskQueue()
+        """
+        queue = cls.__new__(cls)
+        queue._set_location(db_path, fast_unsafe)
+
+        with queue._get_connection() as conn:
+            has_tables = conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0]
+            if has_tables:
+                queue._create_schema(conn)
+            else:
+                with _TEMPLATE_LOCK:
+                    _schema_template().backup(conn)
+
+        queue._enable_wal_mode()
+        return queue
+
+    def _set_location(self, db_path: str, fast_unsafe: bool = False):
+        """Resolve db_path and prepare it for connections"""
+        self._is_uri = str(db_path).startswith("file:")
+        self._fast_unsafe = fast_unsafe
+        self._keepalive: Optional[sqlite3.Connection] = None
+
+        if self._is_uri:
+            self.db_path = str(db_path)
+            if "mode=memory" in self.db_path:
+                # An in-memory database only lives while a connection is open
+                self._keepalive = self._open_connection()
+        else:
+            self.db_path = Path(db_path)
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def close(self):
+        """Release the connection keeping an in-memory database alive"""
+        if self._keepalive is not None:
+            self._keepalive.close()
+            self._keepalive = None
 
     def _open_connection(self):
         """
@@ -66,12 +143,19 @@ class TaskQueue:
         Returns:
             sqlite3.Connection with thread-safe settings
         """
-        return sqlite3.connect(
+        conn = sqlite3.connect(
             str(self.db_path),
             check_same_thread=False,  # Allow multi-thread access
             timeout=30.0,  # Wait up to 30s for database locks
-            isolation_level='DEFERRED'  # Reduce lock contention
+            isolation_level='DEFERRED',  # Reduce lock contention
+            uri=self._is_uri
         )
+        if self._fast_unsafe:
+            # Per-connection settings, so they are applied on every open
+            conn.execute("PRAGMA journal_mode=MEMORY")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
 
     @contextmanager
     def _get_connection(self):
@@ -92,72 +176,109 @@ class TaskQueue:
         Enable Write-Ahead Logging (WAL) mode for better concurrent access
 
         WAL mode allows multiple readers and one writer to access the database
-        concurrently without blocking each other.
+        concurrently without blocking each other. fast_unsafe queues keep
+        the journal in memory instead (also set on every connection they open).
         """
+        journal_mode = "MEMORY" if self._fast_unsafe else "WAL"
         with self._get_connection() as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
             conn.commit()
 
-    def _init_db(self):
-        """Initialize database schema"""
+    @property
+    def journal_mode(self) -> str:
+        """
+        Journal mode of the connections this queue opens (e.g. "wal")
+
+        Read from a fresh connection, since some modes only apply per
+        connection. In-memory databases always report "memory".
+        """
         with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    task_id TEXT PRIMARY KEY,
-                    description TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    skill_name TEXT,
-                    allowed_tools TEXT,  -- JSON array
-                    allowed_directories TEXT,  -- JSON array for sandbox
-                    needs_git INTEGER,  -- Boolean: enable device files for git
-                    system_prompt TEXT,
-                    timeout_seconds INTEGER DEFAULT 900,  -- Execution timeout (default: 15 mins)
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    started_at TEXT,
-                    completed_at TEXT,
-                    result_path TEXT,
-                    error_message TEXT,
-                    token_usage INTEGER,
-                    execution_time REAL,
-                    process_id INTEGER  -- PID of Claude subprocess
-                )
-            """)
+            return conn.execute("PRAGMA journal_mode").fetchone()[0].lower()
 
-            # Migrations
-            cursor = conn.cursor()
-            cursor.execute("PRAGMA table_info(tasks)")
-            columns = [row[1] for row in cursor.fetchall()]
+    def _is_prepared(self) -> bool:
+        """
+        Check whether the database already has the current schema and WAL mode
 
-            if 'needs_git' not in columns:
-                conn.execute("ALTER TABLE tasks ADD COLUMN needs_git INTEGER")
-                conn.commit()
+        Reopening a database (e.g. once per CLI command) then costs a single
+        connection instead of re-running the schema DDL, migrations and
+        journal mode switch.
+        """
+        if self._fast_unsafe:
+            # Its journal mode is per-connection, so there is nothing to detect
+            return False
 
-            if 'process_id' not in columns:
-                conn.execute("ALTER TABLE tasks ADD COLUMN process_id INTEGER")
-                conn.commit()
+        with self._get_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
 
-            # Migration: Add timeout_seconds column and remove estimated_time
-            if 'timeout_seconds' not in columns:
-                conn.execute("ALTER TABLE tasks ADD COLUMN timeout_seconds INTEGER DEFAULT 900")
-                conn.commit()
+        return version == _SCHEMA_VERSION and mode.lower() == "wal"
 
-            # Note: SQLite doesn't support DROP COLUMN easily, so we leave estimated_time if it exists
-            # New code will use timeout_seconds instead
+    def _init_db(self):
+        """Initialize database schema"""
+        with self._get_connection() as conn:
+            self._create_schema(conn)
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """Create tables and apply migrations on an open connection"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                description TEXT NOT NULL,
+                status TEXT NOT NULL,
+                skill_name TEXT,
+                allowed_tools TEXT,  -- JSON array
+                allowed_directories TEXT,  -- JSON array for sandbox
+                needs_git INTEGER,  -- Boolean: enable device files for git
+                system_prompt TEXT,
+                timeout_seconds INTEGER DEFAULT 900,  -- Execution timeout (default: 15 mins)
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                started_at TEXT,
+                completed_at TEXT,
+                result_path TEXT,
+                error_message TEXT,
+                token_usage INTEGER,
+                execution_time REAL,
+                process_id INTEGER  -- PID of Claude subprocess
+            )
+        """)
 
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS task_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    log_level TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    FOREIGN KEY (task_id) REFERENCES tasks(task_id)
-                )
-            """)
+        # Migrations
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(tasks)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'needs_git' not in columns:
+            conn.execute("ALTER TABLE tasks ADD COLUMN needs_git INTEGER")
+            conn.commit()
 
+        if 'process_id' not in columns:
+            conn.execute("ALTER TABLE tasks ADD COLUMN process_id INTEGER")
             conn.commit()
 
+        # Migration: Add timeout_seconds column and remove estimated_time
+        if 'timeout_seconds' not in columns:
+            conn.execute("ALTER TABLE tasks ADD COLUMN timeout_seconds INTEGER DEFAULT 900")
+            conn.commit()
+
+        # Note: SQLite doesn't support DROP COLUMN easily, so we leave estimated_time if it exists
+        # New code will use timeout_seconds instead
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS task_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                log_level TEXT NOT NULL,
+                message TEXT NOT NULL,
+                FOREIGN KEY (task_id) REFERENCES tasks(task_id)
+            )
+        """)
+
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        conn.commit()
+
     def create_task(
         self,
         task_id: str,
@@ -170,6 +291,35 @@ class TaskQueue:
         timeout_seconds: Optional[int] = 900  # Default 15 minutes
     ) -> Task:
         """Create a new task in STAGED state"""
+        with self._get_connection() as conn:
+            task = self._insert_task(
+                conn,
+                task_id,
+                description,
+                skill_name=skill_name,
+                allowed_tools=allowed_tools,
+                allowed_directories=allowed_directories,
+                needs_git=needs_git,
+                system_prompt=system_prompt,
+                timeout_seconds=timeout_seconds
+            )
+            conn.commit()
+
+        return task
+
+    def _insert_task(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str,
+        description: str,
+        skill_name: Optional[str] = None,
+        allowed_tools: Optional[List[str]] = None,
+        allowed_directories: Optional[List[str]] = None,
+        needs_git: Optional[bool] = None,
+        system_prompt: Optional[str] = None,
+        timeout_seconds: Optional[int] = 900
+    ) -> Task:
+        """Insert a STAGED task on an open connection (caller commits)"""
         now = datetime.now().isoformat()
 
         task = Task(
@@ -186,30 +336,61 @@ class TaskQueue:
             updated_at=now
         )
 
-        with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO tasks (
-                    task_id, description, status, skill_name, allowed_tools,
-                    allowed_directories, needs_git, system_prompt, timeout_seconds,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                task.task_id,
-                task.description,
-                task.status,
-                task.skill_name,
-                json.dumps(task.allowed_tools) if task.allowed_tools else None,
-                json.dumps(task.allowed_directories) if task.allowed_directories else None,
-                1 if task.needs_git else 0,
-                task.system_prompt,
-                task.timeout_seconds,
-                task.created_at,
-                task.updated_at
-            ))
-            conn.commit()
+        conn.execute("""
+            INSERT INTO tasks (
+                task_id, description, status, skill_name, allowed_tools,
+                allowed_directories, needs_git, system_prompt, timeout_seconds,
+                created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            task.task_id,
+            task.description,
+            task.status,
+            task.skill_name,
+            json.dumps(task.allowed_tools) if task.allowed_tools else None,
+            json.dumps(task.allowed_directories) if task.allowed_directories else None,
+            1 if task.needs_git else 0,
+            task.system_prompt,
+            task.timeout_seconds,
+            task.created_at,
+            task.updated_at
+        ))
 
         return task
 
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Task:
+        """Build a Task from a tasks row (requires row_factory = sqlite3.Row)"""
+        keys = row.keys()
+
+        # Handle timeout_seconds with fallback to estimated_time for backwards compat
+        timeout_val = row["timeout_seconds"] if "timeout_seconds" in keys else None
+        if timeout_val is None and "estimated_time" in keys:
+            timeout_val = row["estimated_time"]  # Fallback for old tasks
+        if timeout_val is None:
+            timeout_val = 900  # Default 15 minutes
+
+        return Task(
+            task_id=row["task_id"],
+            description=row["description"],
+            status=row["status"],
+            skill_name=row["skill_name"],
+            allowed_tools=json.loads(row["allowed_tools"]) if row["allowed_tools"] else None,
+            allowed_directories=json.loads(row["allowed_directories"]) if row["allowed_directories"] else None,
+            needs_git=bool(row["needs_git"]) if row["needs_git"] is not None else None,
+            system_prompt=row["system_prompt"],
+            timeout_seconds=timeout_val,
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            started_at=row["started_at"],
+            completed_at=row["completed_at"],
+            result_path=row["result_path"],
+            error_message=row["error_message"],
+            token_usage=row["token_usage"],
+            execution_time=row["execution_time"],
+            process_id=row["process_id"]
+        )
+
     def get_task(self, task_id: str) -> Optional[Task]:
         """Retrieve a task by ID"""
         with self._get_connection() as conn:
@@ -223,33 +404,7 @@ class TaskQueue:
             if not row:
                 return None
 
-            # Handle timeout_seconds with fallback to estimated_time for backwards compat
-            timeout_val = row["timeout_seconds"] if "timeout_seconds" in row.keys() else None
-            if timeout_val is None and "estimated_time" in row.keys():
-                timeout_val = row["estimated_time"]  # Fallback for old tasks
-            if timeout_val is None:
-                timeout_val = 900  # Default 15 minutes
-
-            return Task(
-                task_id=row["task_id"],
-                description=row["description"],
-                status=row["status"],
-                skill_name=row["skill_name"],
-                allowed_tools=json.loads(row["allowed_tools"]) if row["allowed_tools"] else None,
-                allowed_directories=json.loads(row["allowed_directories"]) if row["allowed_directories"] else None,
-                needs_git=bool(row["needs_git"]) if row["needs_git"] is not None else None,
-                system_prompt=row["system_prompt"],
-                timeout_seconds=timeout_val,
-                created_at=row["created_at"],
-                updated_at=row["updated_at"],
-                started_at=row["started_at"],
-                completed_at=row["completed_at"],
-                result_path=row["result_path"],
-                error_message=row["error_message"],
-                token_usage=row["token_usage"],
-                execution_time=row["execution_time"],
-                process_id=row["process_id"]
-            )
+            return self._row_to_task(row)
 
     def list_tasks(self, status: Optional[TaskStatus] = None) -> List[Task]:
         """List all tasks, optionally filtered by status"""
@@ -266,41 +421,11 @@ class TaskQueue:
                     "SELECT * FROM tasks ORDER BY created_at DESC"
                 )
 
-            tasks = []
-            for row in cursor.fetchall():
-                # Handle timeout_seconds with fallback to estimated_time for backwards compat
-                timeout_val = row["timeout_seconds"] if "timeout_seconds" in row.keys() else None
-                if timeout_val is None and "estimated_time" in row.keys():
-                    timeout_val = row["estimated_time"]  # Fallback for old tasks
-                if timeout_val is None:
-                    timeout_val = 900  # Default 15 minutes
-
-                tasks.append(Task(
-                    task_id=row["task_id"],
-                    description=row["description"],
-                    status=row["status"],
-                    skill_name=row["skill_name"],
-                    allowed_tools=json.loads(row["allowed_tools"]) if row["allowed_tools"] else None,
-                    allowed_directories=json.loads(row["allowed_directories"]) if row["allowed_directories"] else None,
-                    needs_git=bool(row["needs_git"]) if row["needs_git"] is not None else None,
-                    system_prompt=row["system_prompt"],
-                    timeout_seconds=timeout_val,
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"],
-                    started_at=row["started_at"],
-                    completed_at=row["completed_at"],
-                    result_path=row["result_path"],
-                    error_message=row["error_message"],
-                    token_usage=row["token_usage"],
-                    execution_time=row["execution_time"],
-                    process_id=row["process_id"]
-                ))
-
-            return tasks
+            return [self._row_to_task(row) for row in cursor.fetchall()]
 
     def delete_task(self, task_id: str) -> bool:
         """Delete a task and its logs"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             conn.execute("DELETE FROM task_logs WHERE task_id = ?", (task_id,))
             cursor = conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
             conn.commit()
@@ -313,6 +438,19 @@ class TaskQueue:
         **kwargs
     ) -> bool:
         """Update task status and optional fields"""
+        with self._get_connection() as conn:
+            updated = self._apply_status(conn, task_id, new_status, **kwargs)
+            conn.commit()
+            return updated
+
+    def _apply_status(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str,
+        new_status: TaskStatus,
+        **kwargs
+    ) -> bool:
+        """Update task status on an open connection (caller commits)"""
         now = datetime.now().isoformat()
 
         # Build update query dynamically
@@ -335,13 +473,35 @@ class TaskQueue:
 
         values.append(task_id)
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                f"UPDATE tasks SET {', '.join(update_fields)} WHERE task_id = ?",
-                values
-            )
+        cursor = conn.execute(
+            f"UPDATE tasks SET {', '.join(update_fields)} WHERE task_id = ?",
+            values
+        )
+        return cursor.rowcount > 0
+
+    @contextmanager
+    def bulk(self):
+        """
+        Group task creation and status updates into a single transaction
+
+        Usage:
+            with queue.bulk() as batch:
+                batch.create_task(task_id="task_001", description="...")
+                batch.update_status("task_001", TaskStatus.COMMITTED)
+
+        Yields:
+            TaskBatch whose writes are committed together on exit, or rolled
+            back if the block raises
+        """
+        conn = self._open_connection()
+        try:
+            yield TaskBatch(self, conn)
             conn.commit()
-            return cursor.rowcount > 0
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
     def update_plan(
         self,
@@ -394,6 +554,22 @@ class TaskQueue:
             """, (task_id, datetime.now().isoformat(), log_level, message))
             conn.commit()
 
+    def add_logs(self, task_id: str, entries: List[Tuple[str, str]]):
+        """
+        Add several log entries for a task in one transaction
+
+        Args:
+            task_id: Task the entries belong to
+            entries: (log_level, message) pairs, in the order they happened
+        """
+        now = datetime.now().isoformat()
+        with self._get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO task_logs (task_id, timestamp, log_level, message)
+                VALUES (?, ?, ?, ?)
+            """, [(task_id, now, log_level, message) for log_level, message in entries])
+            conn.commit()
+
     def get_logs(self, task_id: str) -> List[Dict[str, Any]]:
         """Retrieve all logs for a task"""
         with self._get_connection() as conn:
@@ -402,7 +578,7 @@ class TaskQueue:
                 SELECT timestamp, log_level, message
                 FROM task_logs
                 WHERE task_id = ?
-                ORDER BY timestamp ASC
+                ORDER BY timestamp ASC, id ASC
             """, (task_id,))
 
             return [dict(row) for row in cursor.fetchall()]
@@ -418,38 +594,61 @@ class TaskQueue:
         Returns:
             Task object if one was acquired, None if no COMMITTED tasks available
         """
+        tasks = self.acquire_tasks_for_execution(1)
+        return tasks[0] if tasks else None
+
+    def acquire_tasks_for_execution(self, limit: int) -> List[Task]:
+        """
+        Atomically claim up to `limit` COMMITTED tasks and mark them RUNNING
+
+        All tasks are claimed in a single BEGIN IMMEDIATE transaction, oldest
+        first, so concurrent callers never receive the same task.
+
+        Args:
+            limit: Maximum number of tasks to acquire
+
+        Returns:
+            List of acquired tasks (empty if none are COMMITTED)
+        """
+        if limit < 1:
+            return []
+
         conn = self._open_connection()
         try:
             # BEGIN IMMEDIATE acquires a write lock immediately
             conn.execute("BEGIN IMMEDIATE")
 
-            # Find the oldest COMMITTED task
+            # Find the oldest COMMITTED tasks
             cursor = conn.execute("""
                 SELECT task_id FROM tasks
                 WHERE status = ?
                 ORDER BY created_at ASC
-                LIMIT 1
-            """, (TaskStatus.COMMITTED.value,))
+                LIMIT ?
+            """, (TaskStatus.COMMITTED.value, limit))
 
-            row = cursor.fetchone()
-            if not row:
+            task_ids = [row[0] for row in cursor.fetchall()]
+            if not task_ids:
                 conn.rollback()
-                return None
-
-            task_id = row[0]
+                return []
 
             # Update to RUNNING
             now = datetime.now().isoformat()
-            conn.execute("""
+            placeholders = ", ".join("?" * len(task_ids))
+            conn.execute(f"""
                 UPDATE tasks
                 SET status = ?, updated_at = ?, started_at = ?
-                WHERE task_id = ?
-            """, (TaskStatus.RUNNING.value, now, now, task_id))
+                WHERE task_id IN ({placeholders})
+            """, (TaskStatus.RUNNING.value, now, now, *task_ids))
 
-            conn.commit()
+            # Read the claimed rows back inside the same transaction rather
+            # than opening a connection per task afterwards
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"SELECT * FROM tasks WHERE task_id IN ({placeholders})",
+                task_ids
+            ).fetchall()
 
-            # Return the task (using a fresh read)
-            return self.get_task(task_id)
+            conn.commit()
 
         except Exception as e:
             conn.rollback()
@@ -457,6 +656,10 @@ class TaskQueue:
         finally:
             conn.close()
 
+        # Preserve claim order (oldest first)
+        by_id = {row["task_id"]: row for row in rows}
+        return [self._row_to_task(by_id[task_id]) for task_id in task_ids if task_id in by_id]
+
     def count_running_tasks(self) -> int:
         """
         Count how many tasks are currently in RUNNING state
@@ -470,3 +673,31 @@ class TaskQueue:
                 (TaskStatus.RUNNING.value,)
             )
             return cursor.fetchone()[0]
+
+
+class TaskBatch:
+    """Write-only view of a TaskQueue bound to one open transaction (see TaskQueue.bulk)"""
+
+    def __init__(self, queue: TaskQueue, conn: sqlite3.Connection):
+        self._queue = queue
+        self._conn = conn
+
+    def create_task(self, task_id: str, description: str, **kwargs) -> Task:
+        """Create a new task in STAGED state (same arguments as TaskQueue.create_task)"""
+        return self._queue._insert_task(self._conn, task_id, description, **kwargs)
+
+    def update_status(self, task_id: str, new_status: TaskStatus, **kwargs) -> bool:
+        """Update task status and optional fields"""
+        return self._queue._apply_status(self._conn, task_id, new_status, **kwargs)
+
+
+# Serializes backups out of the shared schema template connection
+_TEMPLATE_LOCK = threading.Lock()
+
+
+@cache
+def _schema_template() -> sqlite3.Connection:
+    """In-memory database holding the current schema (see TaskQueue.from_template)"""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    TaskQueue._create_schema(conn)
+    return conn
@@ -153,7 +153,8 @@ class SlackFormatter:
                     # Parse stream-json output to extract text content
                     text_blocks = []
                     for line in stdout.split('\n'):
-                        if line.strip():
+                        # Only text deltas matter; skip decoding other events
+                        if 'content_block_delta' in line:
                             try:
                                 event = json.loads(line)
                                 if event.get('type') == 'content_block_delta':
@@ -23,5 +23,5 @@ setup(
             "nightshift=nightshift.interfaces.cli:main",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.10",
 )
@@ -574,7 +574,7 @@ class TestExecuteTask:
         call_kwargs = mock_notify.call_args[1]
         assert call_kwargs["success"] is True
 
-    def test_execute_task_with_needs_git(self, tmp_setup, mock_process):
+    def test_execute_task_with_needs_git(self, tmp_setup, mock_process, monkeypatch):
         """execute_task loads GH_TOKEN when needs_git is True"""
         manager = AgentManager(
             task_queue=tmp_setup["queue"],
@@ -597,17 +597,19 @@ class TestExecuteTask:
         mock_gh_result.returncode = 0
         mock_gh_result.stdout = "ghp_testtoken123\n"
 
+        mock_run = MagicMock(return_value=mock_gh_result)
+        monkeypatch.setattr("nightshift.core.agent_manager.subprocess.run", mock_run)
+
         with patch("subprocess.Popen", return_value=mock_process):
-            with patch("subprocess.run", return_value=mock_gh_result) as mock_run:
-                with patch("fcntl.fcntl"):
-                    with patch("time.sleep"):
-                        result = manager.execute_task(task)
+            with patch("fcntl.fcntl"):
+                with patch("time.sleep"):
+                    result = manager.execute_task(task)
 
         assert result["success"] is True
         # gh auth token should have been called
         mock_run.assert_called()
 
-    def test_execute_task_gh_token_failure(self, tmp_setup, mock_process):
+    def test_execute_task_gh_token_failure(self, tmp_setup, mock_process, monkeypatch):
         """execute_task continues when GH_TOKEN loading fails"""
         manager = AgentManager(
             task_queue=tmp_setup["queue"],
@@ -625,11 +627,15 @@ class TestExecuteTask:
         tmp_setup["queue"].update_status("task_001", TaskStatus.COMMITTED)
         task = tmp_setup["queue"].get_task("task_001")
 
+        monkeypatch.setattr(
+            "nightshift.core.agent_manager.subprocess.run",
+            MagicMock(side_effect=Exception("gh not found"))
+        )
+
         with patch("subprocess.Popen", return_value=mock_process):
-            with patch("subprocess.run", side_effect=Exception("gh not found")):
-                with patch("fcntl.fcntl"):
-                    with patch("time.sleep"):
-                        result = manager.execute_task(task)
+            with patch("fcntl.fcntl"):
+                with patch("time.sleep"):
+                    result = manager.execute_task(task)
 
         # Should still succeed even if gh fails
         assert result["success"] is True
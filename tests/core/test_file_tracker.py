@@ -3,10 +3,12 @@ Tests for FileTracker - file system change detection
 """
 import pytest
 import json
+import os
 import time
 from pathlib import Path
+from unittest.mock import patch
 
-from nightshift.core.file_tracker import FileTracker, FileChange
+from nightshift.core.file_tracker import FileTracker, FileChange, CONTENT_HASH_MAX_SIZE
 
 
 class TestSnapshots:
@@ -97,6 +99,20 @@ class TestSnapshots:
         assert "valid.txt" in snapshot
         assert "broken_link" not in snapshot
 
+    def test_take_snapshot_shares_path_strings(self, tmp_path):
+        """Consecutive snapshots reuse the same interned path strings"""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.py").write_text("code")
+
+        tracker = FileTracker(watch_dir=str(tmp_path))
+        first = tracker.take_snapshot()
+        second = tracker.take_snapshot()
+
+        key_first = next(iter(first))
+        key_second = next(iter(second))
+        assert key_first == "src/main.py"
+        assert key_first is key_second
+
 
 class TestChangeDetection:
     """Tests for detecting file changes between snapshots"""
@@ -205,6 +221,146 @@ class TestChangeDetection:
         assert len(changes) == 1
         assert changes[0].path == "src/lib/module.py"
 
+    def test_changes_share_single_timestamp(self, tmp_path):
+        """All changes from one stop_tracking carry the same timestamp"""
+        (tmp_path / "to_delete.txt").write_text("content")
+
+        tracker = FileTracker(watch_dir=str(tmp_path))
+        tracker.start_tracking()
+
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        (tmp_path / "to_delete.txt").unlink()
+
+        changes = tracker.stop_tracking()
+
+        assert len(changes) == 3
+        assert len({c.timestamp for c in changes}) == 1
+
+    def test_get_changes_uses_given_timestamp(self, tmp_path):
+        """get_changes stamps changes with an explicit timestamp"""
+        tracker = FileTracker(watch_dir=str(tmp_path))
+        tracker.snapshot_before = {}
+        tracker.snapshot_after = {"gone.txt": 1.0}
+
+        changes = tracker.get_changes(timestamp="2024-01-01T12:00:00")
+
+        assert changes[0].timestamp == "2024-01-01T12:00:00"
+
+
+class TestFastIdleCheck:
+    """Tests for the opt-in root mtime short-circuit"""
+
+    def test_idle_skips_second_snapshot(self, tmp_path):
+        """No snapshot is taken on stop when the root is untouched"""
+        (tmp_path / "unchanged.txt").write_text("content")
+
+        tracker = FileTracker(watch_dir=str(tmp_path), fast_idle_check=True)
+        tracker.start_tracking()
+
+        with patch.object(tracker, "take_snapshot") as mock_snapshot:
+            changes = tracker.stop_tracking()
+
+        assert changes == []
+        mock_snapshot.assert_not_called()
+
+    def test_root_change_still_detected(self, tmp_path):
+        """Creating a file in the root falls through to a full diff"""
+        tracker = FileTracker(watch_dir=str(tmp_path), fast_idle_check=True)
+        tracker.start_tracking()
+
+        # Ensure the directory mtime moves even on coarse filesystems
+        (tmp_path / "new_file.txt").write_text("new content")
+        stat = os.stat(tmp_path)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, tracker._dir_mtimes_ns[""] + 1_000_000_000))
+
+        changes = tracker.stop_tracking()
+
+        assert [c.path for c in changes] == ["new_file.txt"]
+
+    def test_nested_change_still_detected(self, tmp_path):
+        """Creating a file in a subdirectory falls through to a full diff"""
+        src = tmp_path / "src"
+        src.mkdir()
+        top = tmp_path / "top.txt"
+        top.write_text("before")
+
+        tracker = FileTracker(watch_dir=str(tmp_path), fast_idle_check=True)
+        tracker.start_tracking()
+
+        (src / "new.py").write_text("print('hi')")
+        top.write_text("after")
+        # Ensure the mtimes move even on coarse filesystems
+        stat = os.stat(src)
+        os.utime(src, ns=(stat.st_atime_ns, tracker._dir_mtimes_ns["src" + os.sep] + 1_000_000_000))
+        stat = os.stat(top)
+        os.utime(top, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        changes = {c.path: c.change_type for c in tracker.stop_tracking()}
+
+        assert changes == {os.path.join("src", "new.py"): "created", "top.txt": "modified"}
+
+    def test_disabled_by_default(self, tmp_path):
+        """Default trackers always take the closing snapshot"""
+        tracker = FileTracker(watch_dir=str(tmp_path))
+        tracker.start_tracking()
+
+        with patch.object(tracker, "take_snapshot", return_value={}) as mock_snapshot:
+            tracker.stop_tracking()
+
+        mock_snapshot.assert_called_once()
+
+
+class TestContentHash:
+    """Tests for opt-in content fingerprinting"""
+
+    def _bump_mtime(self, path):
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_touch_not_reported_as_modified(self, tmp_path):
+        """A file whose mtime moves without a content change is ignored"""
+        test_file = tmp_path / "touched.txt"
+        test_file.write_text("same")
+
+        tracker = FileTracker(watch_dir=str(tmp_path), content_hash=True)
+        tracker.start_tracking()
+
+        self._bump_mtime(test_file)
+
+        assert tracker.stop_tracking() == []
+
+    def test_real_edit_reported_as_modified(self, tmp_path):
+        """A same-size content change is still reported"""
+        test_file = tmp_path / "edited.txt"
+        test_file.write_text("aaaa")
+
+        tracker = FileTracker(watch_dir=str(tmp_path), content_hash=True)
+        tracker.start_tracking()
+
+        test_file.write_text("bbbb")
+        self._bump_mtime(test_file)
+
+        changes = tracker.stop_tracking()
+
+        assert [(c.path, c.change_type) for c in changes] == [("edited.txt", "modified")]
+
+    def test_large_files_fall_back_to_mtime(self, tmp_path):
+        """Files above the hash size limit are compared by mtime"""
+        big_file = tmp_path / "big.bin"
+        big_file.write_bytes(b"x" * (CONTENT_HASH_MAX_SIZE + 1))
+
+        tracker = FileTracker(watch_dir=str(tmp_path), content_hash=True)
+        tracker.start_tracking()
+
+        assert tracker.fingerprints_before["big.bin"][1] is None
+
+        self._bump_mtime(big_file)
+
+        changes = tracker.stop_tracking()
+
+        assert [c.change_type for c in changes] == ["modified"]
+
 
 class TestSaveChanges:
     """Tests for saving changes to JSON"""
@@ -247,6 +403,18 @@ class TestSaveChanges:
         assert data["changes"][0]["change_type"] == "created"
         assert data["changes"][1]["size"] is None
 
+    def test_save_changes_empty(self, tmp_path):
+        """save_changes writes valid JSON when there are no changes"""
+        tracker = FileTracker(watch_dir=str(tmp_path))
+
+        result_path = tracker.save_changes("task_001", [], output_dir=str(tmp_path))
+
+        with open(result_path) as f:
+            data = json.load(f)
+
+        assert data["task_id"] == "task_001"
+        assert data["changes"] == []
+
 
 class TestFileChangeDataclass:
     """Tests for FileChange dataclass"""
@@ -274,3 +442,12 @@ class TestFileChangeDataclass:
         )
 
         assert change.size == 1024
+
+    def test_filechange_is_immutable(self):
+        """FileChange is frozen and hashable"""
+        change = FileChange(path="test.txt", change_type="created", timestamp="2024-01-01")
+
+        with pytest.raises(AttributeError):
+            change.size = 10
+
+        assert len({change, FileChange("test.txt", "created", "2024-01-01")}) == 1
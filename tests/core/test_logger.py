@@ -6,8 +6,9 @@ import logging
 import json
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
-from nightshift.core.logger import NightShiftLogger
+from nightshift.core.logger import NightShiftLogger, FastFormatter
 
 
 class TestLoggerSetup:
@@ -97,6 +98,16 @@ class TestTaskLogging:
         assert "[task_001] Tool call: Read" in caplog.text
         assert "file_path" in caplog.text
 
+    def test_log_tool_call_skips_encoding_when_disabled(self, tmp_path):
+        """log_tool_call does not encode params when DEBUG is filtered out"""
+        logger = NightShiftLogger(log_dir=str(tmp_path), console_output=False)
+        logger.logger.setLevel(logging.INFO)
+
+        with patch("nightshift.core.logger.json.dumps") as mock_dumps:
+            logger.log_tool_call("task_001", "Read", {"file_path": "/tmp/test.txt"})
+
+        mock_dumps.assert_not_called()
+
     def test_log_task_completed(self, tmp_path, caplog):
         """log_task_completed logs completion with metrics"""
         logger = NightShiftLogger(log_dir=str(tmp_path), console_output=False)
@@ -167,6 +178,35 @@ class TestAgentOutputLogging:
         assert "First output" in content
         assert "Second output" in content
 
+    def test_log_agent_output_reuses_open_file(self, tmp_path):
+        """log_agent_output keeps the task file open between writes"""
+        logger = NightShiftLogger(log_dir=str(tmp_path), console_output=False)
+
+        logger.log_agent_output("task_001", "First output")
+        handle = logger._agent_files["task_001"]
+        logger.log_agent_output("task_001", "Second output")
+
+        assert logger._agent_files["task_001"] is handle
+
+    def test_close_task_releases_file(self, tmp_path):
+        """close_task closes the task file and later writes reopen it"""
+        logger = NightShiftLogger(log_dir=str(tmp_path), console_output=False)
+
+        logger.log_agent_output("task_001", "First output")
+        handle = logger._agent_files["task_001"]
+        logger.close_task("task_001")
+
+        assert handle.closed
+        assert "task_001" not in logger._agent_files
+
+        logger.log_agent_output("task_001", "Second output")
+        logger.close()
+
+        content = (tmp_path / "task_task_001_output.log").read_text()
+        assert "First output" in content
+        assert "Second output" in content
+        assert logger._agent_files == {}
+
 
 class TestGenericLogging:
     """Tests for generic log methods"""
@@ -230,3 +270,16 @@ class TestLogFileContent:
         assert "ERROR" in content
         assert "Test info message" in content
         assert "Test error message" in content
+
+    def test_fast_formatter_matches_standard_format(self):
+        """FastFormatter output matches the equivalent logging.Formatter"""
+        standard = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        fast = FastFormatter()
+
+        record = logging.LogRecord(
+            "nightshift", logging.INFO, __file__, 1, "Value: %s", ("x",), None
+        )
+
+        assert fast.format(record) == standard.format(record)
+        # Second call hits the cached timestamp
+        assert fast.format(record) == standard.format(record)
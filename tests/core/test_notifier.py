@@ -2,13 +2,33 @@
 Tests for Notifier - notification generation and delivery
 """
 import pytest
+import io
 import json
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
+from rich.console import Console
+from rich.markdown import Markdown
 
 from nightshift.core.notifier import Notifier
 from nightshift.core.file_tracker import FileChange
+from nightshift.integrations import slack_formatter
+from nightshift.integrations.slack_client import SlackClient
+
+
+class _StubSlackMetadata:
+    """Minimal in-memory stand-in for SlackMetadataStore"""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def get(self, task_id):
+        return self._data.get(task_id)
+
+    def delete(self, task_id):
+        self._data.pop(task_id, None)
 
 
 @pytest.fixture
@@ -20,6 +40,40 @@ def notifier(tmp_path):
     )
 
 
+@pytest.fixture(scope="class")
+def class_notifier(tmp_path_factory):
+    """Notifier shared by tests in a class that write distinct files"""
+    return Notifier(
+        notification_dir=str(tmp_path_factory.mktemp("notifications")),
+        enable_terminal_output=False
+    )
+
+
+@pytest.fixture(scope="module")
+def notif_root(tmp_path_factory):
+    """Notifications directory shared by tests that never inspect its contents"""
+    return str(tmp_path_factory.mktemp("notifications"))
+
+
+@pytest.fixture(scope="module")
+def notifier_enabled(notif_root):
+    """Shared Notifier with terminal output enabled"""
+    return Notifier(
+        notification_dir=notif_root,
+        enable_terminal_output=True
+    )
+
+
+@pytest.fixture
+def mock_slack_format(monkeypatch):
+    """Replace SlackFormatter.format_completion_notification with a Mock"""
+    mock_format = Mock(return_value=[{"type": "section"}])
+    monkeypatch.setattr(
+        slack_formatter.SlackFormatter, "format_completion_notification", mock_format
+    )
+    return mock_format
+
+
 @pytest.fixture
 def sample_file_changes():
     """Sample file changes for testing"""
@@ -33,9 +87,9 @@ def sample_file_changes():
 class TestGenerateSummary:
     """Tests for generate_summary method"""
 
-    def test_generate_summary_success(self, notifier, sample_file_changes):
+    def test_generate_summary_success(self, class_notifier, sample_file_changes):
         """generate_summary creates complete summary for successful task"""
-        summary = notifier.generate_summary(
+        summary = class_notifier.generate_summary(
             task_id="task_001",
             task_description="Test task",
             success=True,
@@ -53,9 +107,9 @@ class TestGenerateSummary:
         assert summary["error_message"] is None
         assert summary["result_path"] == "/output/result.json"
 
-    def test_generate_summary_failed(self, notifier):
+    def test_generate_summary_failed(self, class_notifier):
         """generate_summary creates summary for failed task"""
-        summary = notifier.generate_summary(
+        summary = class_notifier.generate_summary(
             task_id="task_001",
             task_description="Test task",
             success=False,
@@ -68,9 +122,9 @@ class TestGenerateSummary:
         assert summary["status"] == "failed"
         assert summary["error_message"] == "Task failed due to timeout"
 
-    def test_generate_summary_categorizes_file_changes(self, notifier, sample_file_changes):
+    def test_generate_summary_categorizes_file_changes(self, class_notifier, sample_file_changes):
         """generate_summary categorizes file changes correctly"""
-        summary = notifier.generate_summary(
+        summary = class_notifier.generate_summary(
             task_id="task_001",
             task_description="Test",
             success=True,
@@ -83,9 +137,32 @@ class TestGenerateSummary:
         assert "modified.txt" in summary["file_changes"]["modified"]
         assert "deleted.txt" in summary["file_changes"]["deleted"]
 
-    def test_generate_summary_includes_timestamp(self, notifier):
+    def test_generate_summary_preserves_order_and_ignores_unknown(self, class_notifier):
+        """generate_summary keeps change order and drops unknown change types"""
+        changes = [
+            FileChange(path="b.txt", change_type="created", timestamp="2024-01-01"),
+            FileChange(path="a.txt", change_type="created", timestamp="2024-01-01"),
+            FileChange(path="x.txt", change_type="renamed", timestamp="2024-01-01"),
+        ]
+
+        summary = class_notifier.generate_summary(
+            task_id="task_001",
+            task_description="Test",
+            success=True,
+            execution_time=1.0,
+            token_usage=100,
+            file_changes=changes
+        )
+
+        assert summary["file_changes"] == {
+            "created": ["b.txt", "a.txt"],
+            "modified": [],
+            "deleted": []
+        }
+
+    def test_generate_summary_includes_timestamp(self, class_notifier):
         """generate_summary includes ISO timestamp"""
-        summary = notifier.generate_summary(
+        summary = class_notifier.generate_summary(
             task_id="task_001",
             task_description="Test",
             success=True,
@@ -122,15 +199,16 @@ class TestNotify:
         assert data["task_id"] == "task_001"
         assert data["status"] == "success"
 
-    def test_notify_with_slack_client(self, tmp_path):
+    def test_notify_with_slack_client(self, tmp_path, mock_slack_format):
         """notify sends to Slack when configured"""
-        mock_slack = Mock()
-        mock_metadata = Mock()
-        mock_metadata.get.return_value = {
-            "channel_id": "C12345",
-            "user_id": "U12345",
-            "thread_ts": "1234.5678"
-        }
+        mock_slack = Mock(spec=SlackClient)
+        mock_metadata = _StubSlackMetadata({
+            "task_001": {
+                "channel_id": "C12345",
+                "user_id": "U12345",
+                "thread_ts": "1234.5678"
+            }
+        })
 
         notifier = Notifier(
             notification_dir=str(tmp_path / "notifications"),
@@ -139,26 +217,23 @@ class TestNotify:
             enable_terminal_output=False
         )
 
-        with patch("nightshift.integrations.slack_formatter.SlackFormatter.format_completion_notification") as mock_format:
-            mock_format.return_value = [{"type": "section"}]
-
-            notifier.notify(
-                task_id="task_001",
-                task_description="Test",
-                success=True,
-                execution_time=1.0,
-                token_usage=100,
-                file_changes=[]
-            )
+        notifier.notify(
+            task_id="task_001",
+            task_description="Test",
+            success=True,
+            execution_time=1.0,
+            token_usage=100,
+            file_changes=[]
+        )
 
+        mock_slack_format.assert_called_once()
         mock_slack.post_message.assert_called_once()
-        mock_metadata.delete.assert_called_once_with("task_001")
+        assert mock_metadata.get("task_001") is None
 
     def test_notify_skips_slack_without_metadata(self, tmp_path):
         """notify skips Slack when no metadata for task"""
-        mock_slack = Mock()
-        mock_metadata = Mock()
-        mock_metadata.get.return_value = None  # No metadata
+        mock_slack = Mock(spec=SlackClient)
+        mock_metadata = _StubSlackMetadata({})  # No metadata
 
         notifier = Notifier(
             notification_dir=str(tmp_path / "notifications"),
@@ -179,12 +254,13 @@ class TestNotify:
         # Slack should not be called since no metadata
         mock_slack.post_message.assert_not_called()
 
-    def test_notify_handles_slack_error(self, tmp_path, caplog):
+    def test_notify_handles_slack_error(self, tmp_path, caplog, mock_slack_format):
         """notify handles Slack errors gracefully"""
-        mock_slack = Mock()
+        mock_slack = Mock(spec=SlackClient)
         mock_slack.post_message.side_effect = Exception("Slack error")
-        mock_metadata = Mock()
-        mock_metadata.get.return_value = {"channel_id": "C12345", "user_id": "U12345"}
+        mock_metadata = _StubSlackMetadata({
+            "task_001": {"channel_id": "C12345", "user_id": "U12345"}
+        })
 
         # Enable terminal output to capture warning
         notifier = Notifier(
@@ -194,24 +270,23 @@ class TestNotify:
             enable_terminal_output=True
         )
 
-        with patch("nightshift.integrations.slack_formatter.SlackFormatter.format_completion_notification") as mock_format:
-            mock_format.return_value = []
+        mock_slack_format.return_value = []
 
-            # Should not raise
-            notifier.notify(
-                task_id="task_001",
-                task_description="Test",
-                success=True,
-                execution_time=1.0,
-                token_usage=100,
-                file_changes=[]
-            )
+        # Should not raise
+        notifier.notify(
+            task_id="task_001",
+            task_description="Test",
+            success=True,
+            execution_time=1.0,
+            token_usage=100,
+            file_changes=[]
+        )
 
 
 class TestSaveNotification:
     """Tests for _save_notification method"""
 
-    def test_save_notification_creates_file(self, notifier, tmp_path):
+    def test_save_notification_creates_file(self, class_notifier):
         """_save_notification creates JSON file"""
         summary = {
             "task_id": "task_001",
@@ -219,12 +294,12 @@ class TestSaveNotification:
             "status": "success"
         }
 
-        notifier._save_notification(summary)
+        class_notifier._save_notification(summary)
 
-        file_path = tmp_path / "notifications" / "task_001_notification.json"
+        file_path = class_notifier.notification_dir / "task_001_notification.json"
         assert file_path.exists()
 
-    def test_save_notification_valid_json(self, notifier, tmp_path):
+    def test_save_notification_valid_json(self, class_notifier):
         """_save_notification writes valid JSON"""
         summary = {
             "task_id": "task_002",
@@ -233,22 +308,42 @@ class TestSaveNotification:
             "error_message": "Something went wrong"
         }
 
-        notifier._save_notification(summary)
+        class_notifier._save_notification(summary)
 
-        file_path = tmp_path / "notifications" / "task_002_notification.json"
+        file_path = class_notifier.notification_dir / "task_002_notification.json"
         with open(file_path) as f:
             data = json.load(f)
 
         assert data == summary
 
+    def test_save_notification_compact_by_default(self, class_notifier, monkeypatch):
+        """_save_notification writes compact JSON by default"""
+        monkeypatch.delenv("NIGHTSHIFT_PRETTY_JSON", raising=False)
+
+        class_notifier._save_notification({"task_id": "task_003", "status": "success"})
+
+        file_path = class_notifier.notification_dir / "task_003_notification.json"
+        assert file_path.read_text() == '{"task_id":"task_003","status":"success"}'
+
+    def test_save_notification_pretty_with_env(self, class_notifier, monkeypatch):
+        """NIGHTSHIFT_PRETTY_JSON enables indented output"""
+        monkeypatch.setenv("NIGHTSHIFT_PRETTY_JSON", "1")
+
+        class_notifier._save_notification({"task_id": "task_004", "status": "success"})
+
+        file_path = class_notifier.notification_dir / "task_004_notification.json"
+        assert file_path.read_text() == json.dumps(
+            {"task_id": "task_004", "status": "success"}, indent=2
+        )
+
 
 class TestDisplayTerminal:
     """Tests for _display_terminal method"""
 
-    def test_display_terminal_disabled(self, tmp_path):
+    def test_display_terminal_disabled(self, notif_root):
         """_display_terminal does nothing when disabled"""
         notifier = Notifier(
-            notification_dir=str(tmp_path),
+            notification_dir=notif_root,
             enable_terminal_output=False
         )
 
@@ -264,10 +359,10 @@ class TestDisplayTerminal:
             "result_path": None
         })
 
-    def test_display_terminal_enabled(self, tmp_path):
+    def test_display_terminal_enabled(self, notif_root):
         """_display_terminal outputs when enabled"""
         notifier = Notifier(
-            notification_dir=str(tmp_path),
+            notification_dir=notif_root,
             enable_terminal_output=True
         )
 
@@ -300,17 +395,26 @@ class TestNotifierInit:
 
         assert notif_dir.exists()
 
-    def test_default_terminal_output_enabled(self, tmp_path):
+    def test_no_console_when_terminal_output_disabled(self, notif_root):
+        """Notifier skips creating a rich Console when output is disabled"""
+        notifier = Notifier(
+            notification_dir=notif_root,
+            enable_terminal_output=False
+        )
+
+        assert notifier.console is None
+
+    def test_default_terminal_output_enabled(self, notif_root):
         """Terminal output enabled by default"""
-        notifier = Notifier(notification_dir=str(tmp_path))
+        notifier = Notifier(notification_dir=notif_root)
 
         assert notifier.enable_terminal_output is True
 
-    def test_slack_client_stored(self, tmp_path):
+    def test_slack_client_stored(self, notif_root):
         """Slack client is stored when provided"""
         mock_client = Mock()
         notifier = Notifier(
-            notification_dir=str(tmp_path),
+            notification_dir=notif_root,
             slack_client=mock_client
         )
 
@@ -320,137 +424,82 @@ class TestNotifierInit:
 class TestDisplayTerminalEdgeCases:
     """Edge case tests for _display_terminal"""
 
-    def test_display_terminal_many_created_files(self, tmp_path):
-        """_display_terminal truncates created files > 5"""
-        notifier = Notifier(
-            notification_dir=str(tmp_path),
-            enable_terminal_output=True
-        )
-
-        with patch.object(notifier.console, "print") as mock_print:
-            notifier._display_terminal({
-                "task_id": "task_001",
-                "status": "success",
-                "description": "Test",
-                "execution_time": 30.0,
-                "token_usage": None,
-                "file_changes": {
-                    "created": [f"file_{i}.py" for i in range(10)],
-                    "modified": [],
-                    "deleted": []
-                },
-                "error_message": None,
-                "result_path": None
-            })
-
-        # Should show "and X more" for files beyond 5
-        call_args = str(mock_print.call_args_list)
-        # The Markdown content should include the truncation message
-
-    def test_display_terminal_modified_files(self, tmp_path):
-        """_display_terminal displays modified files"""
-        notifier = Notifier(
-            notification_dir=str(tmp_path),
-            enable_terminal_output=True
-        )
-
-        with patch.object(notifier.console, "print") as mock_print:
-            notifier._display_terminal({
-                "task_id": "task_001",
-                "status": "success",
-                "description": "Test",
-                "execution_time": 30.0,
-                "token_usage": None,
-                "file_changes": {
-                    "created": [],
-                    "modified": ["changed.py", "updated.js"],
-                    "deleted": []
-                },
-                "error_message": None,
-                "result_path": None
-            })
-
-        assert mock_print.called
-
-    def test_display_terminal_many_modified_files(self, tmp_path):
-        """_display_terminal truncates modified files > 5"""
-        notifier = Notifier(
-            notification_dir=str(tmp_path),
-            enable_terminal_output=True
-        )
-
-        with patch.object(notifier.console, "print") as mock_print:
-            notifier._display_terminal({
+    @pytest.mark.parametrize("bucket,count", [
+        ("created", 10),
+        ("modified", 2),
+        ("modified", 10),
+        ("deleted", 2),
+        ("deleted", 10),
+    ])
+    def test_display_terminal_variants(self, notifier_enabled, bucket, count):
+        """_display_terminal lists each change type and truncates beyond 5"""
+        file_changes = {"created": [], "modified": [], "deleted": []}
+        file_changes[bucket] = [f"file_{i}.py" for i in range(count)]
+
+        with patch.object(notifier_enabled.console, "print") as mock_print:
+            notifier_enabled._display_terminal({
                 "task_id": "task_001",
                 "status": "success",
                 "description": "Test",
                 "execution_time": 30.0,
                 "token_usage": None,
-                "file_changes": {
-                    "created": [],
-                    "modified": [f"file_{i}.py" for i in range(10)],
-                    "deleted": []
-                },
+                "file_changes": file_changes,
                 "error_message": None,
                 "result_path": None
             })
 
-        assert mock_print.called
-
-    def test_display_terminal_deleted_files(self, tmp_path):
-        """_display_terminal displays deleted files"""
-        notifier = Notifier(
-            notification_dir=str(tmp_path),
-            enable_terminal_output=True
-        )
-
-        with patch.object(notifier.console, "print") as mock_print:
+        body = mock_print.call_args_list[2].args[0]
+        text = body.markup if isinstance(body, Markdown) else body
+        assert f"**{bucket.capitalize()} ({count}):**" in text
+        if count > 5:
+            assert f"... and {count - 5} more" in text
+        else:
+            assert "more" not in text
+
+    @pytest.mark.parametrize("is_terminal", [True, False])
+    def test_display_terminal_markdown_only_for_terminals(self, notif_root, is_terminal):
+        """Markdown is only parsed when the console is a real terminal"""
+        notifier = Notifier(notification_dir=notif_root, enable_terminal_output=True)
+        notifier.console = Console(file=io.StringIO(), force_terminal=is_terminal)
+
+        with patch("rich.markdown.Markdown") as mock_markdown:
             notifier._display_terminal({
                 "task_id": "task_001",
                 "status": "success",
                 "description": "Test",
                 "execution_time": 30.0,
                 "token_usage": None,
-                "file_changes": {
-                    "created": [],
-                    "modified": [],
-                    "deleted": ["old.py", "deprecated.js"]
-                },
+                "file_changes": {"created": ["new.txt"], "modified": [], "deleted": []},
                 "error_message": None,
                 "result_path": None
             })
 
-        assert mock_print.called
+        assert mock_markdown.called is is_terminal
+        if not is_terminal:
+            assert "new.txt" in notifier.console.file.getvalue()
 
-    def test_display_terminal_many_deleted_files(self, tmp_path):
-        """_display_terminal truncates deleted files > 5"""
-        notifier = Notifier(
-            notification_dir=str(tmp_path),
-            enable_terminal_output=True
-        )
+    def test_display_terminal_bracketed_text_not_terminal(self, notif_root):
+        """Brackets in task text are printed literally, not parsed as Rich markup"""
+        notifier = Notifier(notification_dir=notif_root, enable_terminal_output=True)
+        notifier.console = Console(file=io.StringIO(), force_terminal=False)
 
-        with patch.object(notifier.console, "print") as mock_print:
-            notifier._display_terminal({
-                "task_id": "task_001",
-                "status": "success",
-                "description": "Test",
-                "execution_time": 30.0,
-                "token_usage": None,
-                "file_changes": {
-                    "created": [],
-                    "modified": [],
-                    "deleted": [f"file_{i}.py" for i in range(10)]
-                },
-                "error_message": None,
-                "result_path": None
-            })
+        notifier._display_terminal({
+            "task_id": "task_001",
+            "status": "failed",
+            "description": "Read [/etc/config]",
+            "execution_time": 10.0,
+            "token_usage": None,
+            "file_changes": {"created": [], "modified": [], "deleted": []},
+            "error_message": "KeyError at [/usr/lib/foo]",
+            "result_path": None
+        })
 
-        assert mock_print.called
+        assert "KeyError at [/usr/lib/foo]" in notifier.console.file.getvalue()
 
-    def test_display_terminal_with_error_message(self, tmp_path):
+    def test_display_terminal_with_error_message(self, notif_root):
         """_display_terminal displays error message for failed tasks"""
         notifier = Notifier(
-            notification_dir=str(tmp_path),
+            notification_dir=notif_root,
             enable_terminal_output=True
         )
 
@@ -472,10 +521,10 @@ class TestDisplayTerminalEdgeCases:
 class TestSendEmail:
     """Tests for _send_email method"""
 
-    def test_send_email_is_noop(self, tmp_path):
+    def test_send_email_is_noop(self, notif_root):
         """_send_email is a no-op stub"""
         notifier = Notifier(
-            notification_dir=str(tmp_path),
+            notification_dir=notif_root,
             enable_terminal_output=False
         )
 
@@ -7,7 +7,7 @@ import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
-from nightshift.core.sandbox import SandboxManager
+from nightshift.core.sandbox import SandboxManager, _render_profile
 
 
 class TestProfileCreation:
@@ -132,8 +132,8 @@ class TestProfileCreation:
         """Sandbox manager tracks created profile files"""
         sandbox = SandboxManager()
 
-        profile1 = sandbox.create_profile([str(tmp_path)])
-        profile2 = sandbox.create_profile([str(tmp_path)])
+        profile1 = sandbox.create_profile([str(tmp_path / "a")])
+        profile2 = sandbox.create_profile([str(tmp_path / "b")])
 
         assert len(sandbox._temp_profiles) == 2
         assert profile1 in sandbox._temp_profiles
@@ -141,6 +141,31 @@ class TestProfileCreation:
 
         sandbox.cleanup()
 
+    def test_create_profile_reuses_identical_profile(self, tmp_path):
+        """Identical inputs return the same profile file"""
+        sandbox = SandboxManager()
+
+        profile1 = sandbox.create_profile([str(tmp_path)])
+        profile2 = sandbox.create_profile([str(tmp_path)])
+
+        assert profile1 == profile2
+        assert len(sandbox._temp_profiles) == 1
+
+        sandbox.cleanup()
+
+    def test_create_profile_rewrites_missing_cached_file(self, tmp_path):
+        """A cached profile deleted from disk is written again"""
+        sandbox = SandboxManager()
+
+        profile1 = sandbox.create_profile([str(tmp_path)])
+        Path(profile1).unlink()
+        profile2 = sandbox.create_profile([str(tmp_path)])
+
+        assert profile2 != profile1
+        assert Path(profile2).exists()
+
+        sandbox.cleanup()
+
     def test_create_profile_warns_on_nonexistent_directory(self, tmp_path, caplog):
         """Profile creation warns when allowed directory doesn't exist"""
         sandbox = SandboxManager()
@@ -160,6 +185,26 @@ class TestProfileCreation:
         sandbox.cleanup()
 
 
+class TestRenderProfile:
+    """Tests for the memoized profile renderer"""
+
+    def test_render_profile_is_cached(self):
+        """Identical inputs reuse the rendered profile text"""
+        first = _render_profile(("/a.json",), ("/tmp", "/work"), False)
+        second = _render_profile(("/a.json",), ("/tmp", "/work"), False)
+
+        assert first is second
+
+    def test_render_profile_git_block(self):
+        """Git network services are only rendered when needs_git is set"""
+        with_git = _render_profile((), ("/tmp",), True)
+        without_git = _render_profile((), ("/tmp",), False)
+
+        assert "com.apple.trustd" in with_git
+        assert "com.apple.trustd" not in without_git
+        assert with_git.endswith('(allow file-write* (subpath "/tmp"))')
+
+
 class TestWrapCommand:
     """Tests for wrap_command method"""
 
@@ -222,7 +267,7 @@ class TestCleanup:
         sandbox.cleanup()
         assert len(sandbox._temp_profiles) == 0
 
-    def test_cleanup_handles_missing_files(self, tmp_path):
+    def test_cleanup_handles_missing_files(self, tmp_path, caplog):
         """cleanup handles already-deleted files gracefully"""
         sandbox = SandboxManager()
 
@@ -230,13 +275,23 @@ class TestCleanup:
         # Manually delete the file
         Path(profile).unlink()
 
-        # Should not raise
-        sandbox.cleanup()
+        # Should not raise or warn
+        with caplog.at_level("WARNING"):
+            sandbox.cleanup()
+
+        assert "Failed to cleanup" not in caplog.text
 
 
 class TestIsAvailable:
     """Tests for sandbox availability check"""
 
+    @pytest.fixture(autouse=True)
+    def clear_availability_cache(self):
+        """Ensure each test performs a fresh lookup"""
+        SandboxManager.is_available.cache_clear()
+        yield
+        SandboxManager.is_available.cache_clear()
+
     def test_is_available_returns_bool(self):
         """is_available returns a boolean"""
         result = SandboxManager.is_available()
@@ -256,6 +311,16 @@ class TestIsAvailable:
 
         assert SandboxManager.is_available() is False
 
+    @patch("shutil.which")
+    def test_is_available_is_cached(self, mock_which):
+        """is_available only searches PATH once"""
+        mock_which.return_value = None
+
+        SandboxManager.is_available()
+        SandboxManager.is_available()
+
+        mock_which.assert_called_once_with("sandbox-exec")
+
 
 class TestValidateDirectories:
     """Tests for directory validation"""
@@ -335,6 +400,13 @@ class TestValidateDirectories:
 
         assert "system directory" in str(exc_info.value)
 
+    def test_validate_allows_similar_prefix(self, tmp_path):
+        """validate_directories only rejects true children of dangerous paths"""
+        with patch.object(Path, "resolve", return_value=Path("/usrlocal/project")):
+            result = SandboxManager.validate_directories(["/usrlocal/project"])
+
+        assert result == ["/usrlocal/project"]
+
     def test_validate_warns_home_directory(self, tmp_path, caplog):
         """validate_directories warns about home directory"""
         import logging
@@ -3,19 +3,40 @@ Tests for TaskQueue basic operations
 """
 import pytest
 import json
+import uuid
 from pathlib import Path
 
 from nightshift.core.task_queue import TaskQueue, TaskStatus, Task
 
 
+@pytest.fixture(scope="module")
+def queue():
+    """
+    One in-memory TaskQueue shared by the tests in this module
+
+    Tests using it pick distinct task_ids and never assert on table-wide
+    counts or ordering; those build their own queue from tmp_path. Keeping
+    it in memory skips the disk writes and fsyncs of a file database.
+    """
+    queue = TaskQueue(db_path=f"file:tq_{uuid.uuid4().hex}?mode=memory&cache=shared")
+    yield queue
+    queue.close()
+
+
+def seed_tasks(queue, status, *task_ids):
+    """Create tasks directly in the given status, all in one transaction"""
+    with queue.bulk() as batch:
+        for task_id in task_ids:
+            batch.create_task(task_id=task_id, description=f"Seeded {task_id}")
+            if status != TaskStatus.STAGED:
+                batch.update_status(task_id, status)
+
+
 class TestTaskCreation:
     """Tests for task creation and retrieval"""
 
-    def test_create_task_basic(self, tmp_path):
+    def test_create_task_basic(self, queue):
         """Create a task with minimal parameters"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         task = queue.create_task(
             task_id="task_001",
             description="Test task"
@@ -27,11 +48,8 @@ class TestTaskCreation:
         assert task.created_at is not None
         assert task.updated_at is not None
 
-    def test_create_task_with_all_fields(self, tmp_path):
+    def test_create_task_with_all_fields(self, queue):
         """Create a task with all optional fields"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         task = queue.create_task(
             task_id="task_002",
             description="Full task",
@@ -50,52 +68,37 @@ class TestTaskCreation:
         assert task.system_prompt == "You are a helpful assistant"
         assert task.timeout_seconds == 1800
 
-    def test_allowed_tools_none_roundtrip(self, tmp_path):
+    def test_allowed_tools_none_roundtrip(self, queue):
         """allowed_tools None should roundtrip correctly"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_003", description="Test")
         task = queue.get_task("task_003")
 
         assert task.allowed_tools is None
 
-    def test_allowed_directories_none_roundtrip(self, tmp_path):
+    def test_allowed_directories_none_roundtrip(self, queue):
         """allowed_directories None should roundtrip correctly"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_004", description="Test")
         task = queue.get_task("task_004")
 
         assert task.allowed_directories is None
 
-    def test_needs_git_false_when_omitted(self, tmp_path):
+    def test_needs_git_false_when_omitted(self, queue):
         """needs_git should be falsy when not specified"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_005", description="Test")
         task = queue.get_task("task_005")
 
         # needs_git is stored as 0 when not specified, which becomes False
         assert not task.needs_git
 
-    def test_needs_git_true_persistence(self, tmp_path):
+    def test_needs_git_true_persistence(self, queue):
         """needs_git=True should persist correctly"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_006", description="Test", needs_git=True)
         task = queue.get_task("task_006")
 
         assert task.needs_git is True
 
-    def test_timeout_seconds_default(self, tmp_path):
+    def test_timeout_seconds_default(self, queue):
         """timeout_seconds should default to 900 (15 mins)"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         task = queue.create_task(task_id="task_007", description="Test")
         assert task.timeout_seconds == 900
 
@@ -103,11 +106,8 @@ class TestTaskCreation:
         retrieved = queue.get_task("task_007")
         assert retrieved.timeout_seconds == 900
 
-    def test_get_nonexistent_task(self, tmp_path):
+    def test_get_nonexistent_task(self, queue):
         """get_task returns None for nonexistent task"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         task = queue.get_task("nonexistent")
         assert task is None
 
@@ -117,26 +117,81 @@ class TestWALMode:
 
     def test_wal_mode_enabled(self, tmp_path):
         """WAL mode should be enabled on initialization"""
+        queue = TaskQueue(db_path=str(tmp_path / "test.db"))
+
+        assert queue.journal_mode == "wal"
+
+    def test_fast_unsafe_keeps_journal_in_memory(self, tmp_path):
+        """fast_unsafe queues skip WAL and fsyncs but still work normally"""
         db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
+        queue = TaskQueue(db_path=str(db_path), fast_unsafe=True)
 
-        import sqlite3
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.execute("PRAGMA journal_mode")
-        mode = cursor.fetchone()[0]
-        conn.close()
+        queue.create_task(task_id="fast_001", description="Fast")
+        assert queue.get_task("fast_001") is not None
+
+        assert queue.journal_mode == "memory"
+
+
+class TestInMemoryQueue:
+    """Tests for in-memory queues opened from a file: URI"""
+
+    def test_memory_uri_persists_across_connections(self):
+        """Tasks survive between calls while the queue is open"""
+        queue = TaskQueue(db_path=f"file:tq_persist_{uuid.uuid4().hex}?mode=memory&cache=shared")
+        try:
+            queue.create_task(task_id="mem_001", description="In memory")
+            queue.update_status("mem_001", TaskStatus.COMMITTED)
+
+            task = queue.get_task("mem_001")
+            assert task.status == TaskStatus.COMMITTED.value
+            assert queue.delete_task("mem_001") is True
+        finally:
+            queue.close()
+
+    def test_memory_uri_released_on_close(self):
+        """Closing the queue discards the in-memory database"""
+        uri = f"file:tq_close_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        queue = TaskQueue(db_path=uri)
+        queue.create_task(task_id="mem_001", description="In memory")
+        queue.close()
+
+        reopened = TaskQueue(db_path=uri)
+        try:
+            assert reopened.get_task("mem_001") is None
+        finally:
+            reopened.close()
+
+
+class TestFromTemplate:
+    """Tests for TaskQueue.from_template"""
 
-        assert mode.lower() == "wal"
+    def test_from_template_creates_usable_queue(self, tmp_path):
+        """A queue opened from the template has the full schema and WAL mode"""
+        db_path = tmp_path / "test.db"
+        queue = TaskQueue.from_template(str(db_path))
+
+        queue.create_task(task_id="tpl_001", description="Template", timeout_seconds=60)
+        queue.add_log("tpl_001", "INFO", "hello")
+
+        assert queue.get_task("tpl_001").timeout_seconds == 60
+        assert len(queue.get_logs("tpl_001")) == 1
+        assert queue.journal_mode == "wal"
+
+    def test_from_template_keeps_existing_data(self, tmp_path):
+        """An existing database is not overwritten by the template"""
+        db_path = tmp_path / "test.db"
+        TaskQueue(db_path=str(db_path)).create_task(task_id="keep_001", description="Keep")
+
+        queue = TaskQueue.from_template(str(db_path))
+
+        assert queue.get_task("keep_001") is not None
 
 
 class TestStatusTransitions:
     """Tests for status update behavior"""
 
-    def test_running_sets_started_at(self, tmp_path):
+    def test_running_sets_started_at(self, queue):
         """Transitioning to RUNNING should set started_at"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_010", description="Test")
         queue.update_status("task_010", TaskStatus.COMMITTED)
         queue.update_status("task_010", TaskStatus.RUNNING)
@@ -145,11 +200,8 @@ class TestStatusTransitions:
         assert task.status == TaskStatus.RUNNING.value
         assert task.started_at is not None
 
-    def test_completed_sets_completed_at(self, tmp_path):
+    def test_completed_sets_completed_at(self, queue):
         """Transitioning to COMPLETED should set completed_at"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_011", description="Test")
         queue.update_status("task_011", TaskStatus.RUNNING)
         queue.update_status("task_011", TaskStatus.COMPLETED)
@@ -158,11 +210,8 @@ class TestStatusTransitions:
         assert task.status == TaskStatus.COMPLETED.value
         assert task.completed_at is not None
 
-    def test_failed_sets_completed_at(self, tmp_path):
+    def test_failed_sets_completed_at(self, queue):
         """Transitioning to FAILED should set completed_at"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_012", description="Test")
         queue.update_status("task_012", TaskStatus.RUNNING)
         queue.update_status("task_012", TaskStatus.FAILED, error_message="Something went wrong")
@@ -172,11 +221,8 @@ class TestStatusTransitions:
         assert task.completed_at is not None
         assert task.error_message == "Something went wrong"
 
-    def test_cancelled_sets_completed_at(self, tmp_path):
+    def test_cancelled_sets_completed_at(self, queue):
         """Transitioning to CANCELLED should set completed_at"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_013", description="Test")
         queue.update_status("task_013", TaskStatus.CANCELLED)
 
@@ -184,11 +230,8 @@ class TestStatusTransitions:
         assert task.status == TaskStatus.CANCELLED.value
         assert task.completed_at is not None
 
-    def test_update_status_with_kwargs(self, tmp_path):
+    def test_update_status_with_kwargs(self, queue):
         """update_status should accept additional fields via kwargs"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_014", description="Test")
         queue.update_status(
             "task_014",
@@ -203,11 +246,8 @@ class TestStatusTransitions:
         assert task.token_usage == 1000
         assert task.execution_time == 45.5
 
-    def test_update_status_ignores_unknown_kwargs(self, tmp_path):
+    def test_update_status_ignores_unknown_kwargs(self, queue):
         """update_status should ignore unknown kwargs"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_015", description="Test")
         # Should not raise even with unknown kwarg
         result = queue.update_status(
@@ -219,14 +259,38 @@ class TestStatusTransitions:
         assert result is True
 
 
+class TestBulk:
+    """Tests for batching writes with TaskQueue.bulk"""
+
+    def test_bulk_commits_all_writes(self, tmp_path):
+        """Writes made through a batch are visible after the block"""
+        db_path = tmp_path / "test.db"
+        queue = TaskQueue(db_path=str(db_path), fast_unsafe=True)
+
+        with queue.bulk() as batch:
+            for i in range(3):
+                task = batch.create_task(task_id=f"bulk_{i}", description=f"Bulk {i}")
+                assert task.status == TaskStatus.STAGED.value
+                assert batch.update_status(f"bulk_{i}", TaskStatus.COMMITTED) is True
+
+        tasks = queue.list_tasks(TaskStatus.COMMITTED)
+        assert sorted(t.task_id for t in tasks) == ["bulk_0", "bulk_1", "bulk_2"]
+
+    def test_bulk_rolls_back_on_error(self, queue):
+        """No writes from a failed batch are kept"""
+        with pytest.raises(RuntimeError):
+            with queue.bulk() as batch:
+                batch.create_task(task_id="bulk_0", description="Bulk")
+                raise RuntimeError("abort")
+
+        assert queue.get_task("bulk_0") is None
+
+
 class TestUpdatePlan:
     """Tests for plan update functionality"""
 
-    def test_update_plan_staged_task(self, tmp_path):
+    def test_update_plan_staged_task(self, queue):
         """update_plan should work for STAGED tasks"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_020", description="Original")
         result = queue.update_plan(
             "task_020",
@@ -241,11 +305,8 @@ class TestUpdatePlan:
         assert task.allowed_tools == ["Read"]
         assert task.timeout_seconds == 600
 
-    def test_update_plan_rejected_for_non_staged(self, tmp_path):
+    def test_update_plan_rejected_for_non_staged(self, queue):
         """update_plan should be rejected for non-STAGED tasks"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_021", description="Original")
         queue.update_status("task_021", TaskStatus.COMMITTED)
 
@@ -260,15 +321,14 @@ class TestUpdatePlan:
 class TestLogging:
     """Tests for task logging functionality"""
 
-    def test_add_and_get_logs(self, tmp_path):
-        """add_log and get_logs should work correctly"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
+    def test_add_and_get_logs(self, queue):
+        """add_logs and get_logs should work correctly"""
         queue.create_task(task_id="task_030", description="Test")
-        queue.add_log("task_030", "INFO", "First log")
-        queue.add_log("task_030", "DEBUG", "Second log")
-        queue.add_log("task_030", "ERROR", "Third log")
+        queue.add_logs("task_030", [
+            ("INFO", "First log"),
+            ("DEBUG", "Second log"),
+            ("ERROR", "Third log"),
+        ])
 
         logs = queue.get_logs("task_030")
 
@@ -278,15 +338,10 @@ class TestLogging:
         assert logs[1]["log_level"] == "DEBUG"
         assert logs[2]["log_level"] == "ERROR"
 
-    def test_logs_ordered_by_timestamp(self, tmp_path):
-        """Logs should be returned in chronological order"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
+    def test_logs_ordered_by_timestamp(self, queue):
+        """Logs should be returned in the order they were added"""
         queue.create_task(task_id="task_031", description="Test")
-        queue.add_log("task_031", "INFO", "First")
-        queue.add_log("task_031", "INFO", "Second")
-        queue.add_log("task_031", "INFO", "Third")
+        queue.add_logs("task_031", [("INFO", "First"), ("INFO", "Second"), ("INFO", "Third")])
 
         logs = queue.get_logs("task_031")
 
@@ -294,11 +349,8 @@ class TestLogging:
         assert logs[1]["message"] == "Second"
         assert logs[2]["message"] == "Third"
 
-    def test_delete_task_removes_logs(self, tmp_path):
+    def test_delete_task_removes_logs(self, queue):
         """Deleting a task should also remove its logs"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_032", description="Test")
         queue.add_log("task_032", "INFO", "Log entry")
 
@@ -317,7 +369,7 @@ class TestListTasks:
     def test_list_all_tasks(self, tmp_path):
         """list_tasks without filter returns all tasks"""
         db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
+        queue = TaskQueue(db_path=str(db_path), fast_unsafe=True)
 
         queue.create_task(task_id="task_040", description="Task 1")
         queue.create_task(task_id="task_041", description="Task 2")
@@ -329,13 +381,10 @@ class TestListTasks:
     def test_list_tasks_filtered_by_status(self, tmp_path):
         """list_tasks with status filter returns matching tasks"""
         db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
+        queue = TaskQueue(db_path=str(db_path), fast_unsafe=True)
 
-        queue.create_task(task_id="task_050", description="Staged 1")
-        queue.create_task(task_id="task_051", description="Staged 2")
-        queue.create_task(task_id="task_052", description="Running")
-        queue.update_status("task_052", TaskStatus.COMMITTED)
-        queue.update_status("task_052", TaskStatus.RUNNING)
+        seed_tasks(queue, TaskStatus.STAGED, "task_050", "task_051")
+        seed_tasks(queue, TaskStatus.RUNNING, "task_052")
 
         staged = queue.list_tasks(TaskStatus.STAGED)
         running = queue.list_tasks(TaskStatus.RUNNING)
@@ -347,7 +396,7 @@ class TestListTasks:
     def test_list_tasks_ordered_by_created_at_desc(self, tmp_path):
         """list_tasks should return newest first"""
         db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
+        queue = TaskQueue(db_path=str(db_path), fast_unsafe=True)
 
         queue.create_task(task_id="task_060", description="First")
         queue.create_task(task_id="task_061", description="Second")
@@ -364,22 +413,16 @@ class TestListTasks:
 class TestDeleteTask:
     """Tests for task deletion"""
 
-    def test_delete_existing_task(self, tmp_path):
+    def test_delete_existing_task(self, queue):
         """delete_task returns True for existing task"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         queue.create_task(task_id="task_070", description="To delete")
         result = queue.delete_task("task_070")
 
         assert result is True
         assert queue.get_task("task_070") is None
 
-    def test_delete_nonexistent_task(self, tmp_path):
+    def test_delete_nonexistent_task(self, queue):
         """delete_task returns False for nonexistent task"""
-        db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
-
         result = queue.delete_task("nonexistent")
         assert result is False
 
@@ -390,21 +433,14 @@ class TestCountRunningTasks:
     def test_count_running_tasks(self, tmp_path):
         """count_running_tasks returns correct count"""
         db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
+        queue = TaskQueue(db_path=str(db_path), fast_unsafe=True)
 
         # Initially zero
         assert queue.count_running_tasks() == 0
 
         # Create and run some tasks
-        queue.create_task(task_id="task_080", description="Running 1")
-        queue.update_status("task_080", TaskStatus.COMMITTED)
-        queue.update_status("task_080", TaskStatus.RUNNING)
-
-        queue.create_task(task_id="task_081", description="Running 2")
-        queue.update_status("task_081", TaskStatus.COMMITTED)
-        queue.update_status("task_081", TaskStatus.RUNNING)
-
-        queue.create_task(task_id="task_082", description="Staged")
+        seed_tasks(queue, TaskStatus.RUNNING, "task_080", "task_081")
+        seed_tasks(queue, TaskStatus.STAGED, "task_082")
 
         assert queue.count_running_tasks() == 2
 
@@ -428,6 +464,16 @@ class TestTaskDataclass:
         assert d["status"] == "staged"
         assert d["allowed_tools"] == ["Read"]
 
+    def test_to_dict_covers_every_field_and_copies_lists(self):
+        """Task.to_dict returns every field and does not share lists with the task"""
+        task = Task(task_id="test_002", description="Test task", status="staged", allowed_tools=["Read"])
+
+        d = task.to_dict()
+        d["allowed_tools"].append("Write")
+
+        assert set(d) == set(Task.__dataclass_fields__)
+        assert task.allowed_tools == ["Read"]
+
 
 class TestMigrations:
     """Tests for database schema migrations"""
@@ -556,6 +602,19 @@ class TestMigrations:
         )
         assert task.timeout_seconds == 1800
 
+    def test_reopen_skips_schema_setup(self, tmp_path, monkeypatch):
+        """Reopening an up-to-date database does not re-run schema setup"""
+        db_path = tmp_path / "test.db"
+        TaskQueue(db_path=str(db_path)).create_task(task_id="reopen_001", description="Test")
+
+        setups = []
+        monkeypatch.setattr(TaskQueue, "_init_db", lambda self: setups.append(self))
+        queue = TaskQueue(db_path=str(db_path))
+
+        assert setups == []
+        assert queue.get_task("reopen_001") is not None
+        assert queue.journal_mode == "wal"
+
 
 class TestTimeoutFallback:
     """Tests for timeout_seconds backwards compatibility"""
@@ -667,7 +726,7 @@ class TestAcquireTaskExceptions:
         from unittest.mock import patch, MagicMock, create_autospec
         import sqlite3
         db_path = tmp_path / "test.db"
-        queue = TaskQueue(db_path=str(db_path))
+        queue = TaskQueue(db_path=str(db_path), fast_unsafe=True)
 
         queue.create_task(task_id="rollback_test", description="Test")
         queue.update_status("rollback_test", TaskStatus.COMMITTED)
@@ -84,6 +84,53 @@ class TestAcquireTaskForExecution:
         assert task.status == TaskStatus.RUNNING.value
         assert task.started_at is not None
 
+    def test_acquire_batch_claims_up_to_limit(self, tmp_path):
+        """acquire_tasks_for_execution claims the oldest N COMMITTED tasks"""
+        db_path = tmp_path / "test.db"
+        queue = TaskQueue(db_path=str(db_path))
+
+        for i in range(4):
+            queue.create_task(task_id=f"task_{i:03d}", description=f"Task {i}")
+            queue.update_status(f"task_{i:03d}", TaskStatus.COMMITTED)
+
+        tasks = queue.acquire_tasks_for_execution(3)
+
+        assert [t.task_id for t in tasks] == ["task_000", "task_001", "task_002"]
+        assert all(t.status == TaskStatus.RUNNING.value for t in tasks)
+        assert queue.get_task("task_003").status == TaskStatus.COMMITTED.value
+
+    def test_acquire_batch_uses_single_connection(self, tmp_path):
+        """Claimed tasks are read back on the claiming connection"""
+        db_path = tmp_path / "test.db"
+        queue = TaskQueue(db_path=str(db_path))
+
+        for i in range(5):
+            queue.create_task(task_id=f"task_{i:03d}", description=f"Task {i}")
+            queue.update_status(f"task_{i:03d}", TaskStatus.COMMITTED)
+
+        opened = []
+        original_open = queue._open_connection
+
+        def counting_open():
+            opened.append(1)
+            return original_open()
+
+        queue._open_connection = counting_open
+        tasks = queue.acquire_tasks_for_execution(5)
+
+        assert len(tasks) == 5
+        assert len(opened) == 1
+        assert tasks[0].description == "Task 0"
+
+    def test_acquire_batch_returns_empty_when_no_committed(self, tmp_path):
+        """acquire_tasks_for_execution returns [] with nothing to claim"""
+        db_path = tmp_path / "test.db"
+        queue = TaskQueue(db_path=str(db_path))
+        queue.create_task(task_id="task_001", description="Test")
+
+        assert queue.acquire_tasks_for_execution(5) == []
+        assert queue.acquire_tasks_for_execution(0) == []
+
 
 class TestConcurrentAcquire:
     """Tests for concurrent access to acquire_task_for_execution"""
@@ -2,7 +2,7 @@
 Tests for SlackFormatter
 """
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
 import json
 
@@ -350,6 +350,37 @@ class TestFormatCompletionNotificationEdgeCases:
         blocks_text = " ".join([str(b) for b in blocks])
         assert "truncated" in blocks_text.lower()
 
+    def test_result_path_skips_non_delta_events(self, tmp_path):
+        """format_completion_notification only decodes text delta events"""
+        output_file = tmp_path / "task_001_output.json"
+        stream_json = {
+            "stdout": "\n".join([
+                '{"type": "message_start", "message": {"text": "ignored"}}',
+                '{"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Kept"}}',
+                'not json at all',
+            ]),
+            "stderr": ""
+        }
+        output_file.write_text(json.dumps(stream_json))
+
+        summary = {
+            "task_id": "task_001",
+            "status": "success",
+            "description": "Test",
+            "execution_time": 30.0,
+            "result_path": str(output_file)
+        }
+
+        with patch("json.loads", wraps=json.loads) as mock_loads:
+            blocks = SlackFormatter.format_completion_notification(summary)
+
+        blocks_text = " ".join([str(b) for b in blocks])
+        assert "Kept" in blocks_text
+        assert "ignored" not in blocks_text
+        decoded = [c.args[0] for c in mock_loads.call_args_list]
+        assert not any("message_start" in d and "stdout" not in d for d in decoded)
+        assert "not json at all" not in decoded
+
     def test_result_path_handles_invalid_json(self, tmp_path):
         """format_completion_notification handles invalid JSON gracefully"""
         output_file = tmp_path / "task_001_output.json"